@@ -10,5 +10,6 @@ init_core(app)
 if __name__ == '__main__':
     print("Starting flask server...")
     app.run(threaded=True)
-else:
+elif __name__ != '__mp_main__':
+    # Job worker processes are spawned and import this module as __mp_main__, they must not start the CLI.
     core_cli()
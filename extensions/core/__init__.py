@@ -14,6 +14,7 @@ from . core import blueprint, login_manager, init_core
 from . cli import core_cli
 from . import views
 from . import grid
+from . import asyncgrid
 
 
 
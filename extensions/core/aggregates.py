@@ -0,0 +1,152 @@
+"""
+Identification
+    Module:     aggregates.py
+    Author:     Victor Puska
+    Written:    Oct 19, 2026
+    Copyright:  (c) 2026 by VICTOR PUSKA.
+    License:    LICENSE_NAME, see LICENSE_FILE for more details.
+
+Description
+    Denormalized aggregate columns maintained incrementally by ORM flush hooks.
+"""
+
+from collections import defaultdict
+from typing import List
+
+from sqlalchemy import event, inspect, select, update, func
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import InstrumentedAttribute
+
+
+class MaintainedAggregate(object):
+    """A count (or sum) of child rows stored in a column of the parent table.
+
+    The aggregate is declared with the parent's target column and the child's foreign key column, e.g.
+    ``MaintainedAggregate(MyUserClass.item_count, Items.userid)``.  Whenever child rows are inserted, deleted or
+    moved to another parent through the ORM, the flush applies the change as an increment to the affected
+    parent rows.  Bulk statements bypass the ORM, use `rebuild` to recompute the column from the child table.
+    """
+
+    registry: List['MaintainedAggregate'] = []
+
+    def __init__(self, target: InstrumentedAttribute, foreign_key: InstrumentedAttribute,
+                 summed: InstrumentedAttribute = None):
+        self.target = target                # Parent column holding the aggregate
+        self.foreign_key = foreign_key      # Child column referencing the parent's primary key
+        self.summed = summed                # Child column to sum, the aggregate is a row count if None
+        self.parent = target.class_
+        self.child = foreign_key.class_
+        self.parent_key = inspect(self.parent).primary_key[0]
+        target.info['maintained'] = self
+        MaintainedAggregate.registry.append(self)
+        # The flush needs the committed foreign key (and summed value) of changed children, make sure they are
+        # loaded before they are overwritten, including when the child is moved through a relationship.
+        event.listen(foreign_key, "set", self._load_committed, active_history=True)
+        if summed is not None:
+            event.listen(summed, "set", self._load_committed, active_history=True)
+        fk_column = foreign_key.property.columns[0]
+        for rel in inspect(self.child).relationships:
+            if fk_column in rel.local_columns:
+                event.listen(getattr(self.child, rel.key), "set", self._load_committed)
+
+    def __repr__(self):
+        return "<MaintainedAggregate %s>" % self.target
+
+    def _load_committed(self, target, value, oldvalue, initiator):
+        if inspect(target).persistent:
+            getattr(target, self.foreign_key.key)
+
+    def _value(self, obj, state=None):
+        """Returns the contribution of a child object to its parent's aggregate."""
+        if self.summed is None:
+            return 1
+        value = getattr(obj, self.summed.key) if state is None else state
+        return value or 0
+
+    def deltas(self, session: Session):
+        """Returns a dictionary {parent id: change} for the child objects being flushed by the session."""
+        deltas = defaultdict(int)
+        fk = self.foreign_key.key
+        for obj in session.new:
+            if isinstance(obj, self.child):
+                deltas[getattr(obj, fk)] += self._value(obj)
+        for obj in session.deleted:
+            if isinstance(obj, self.child):
+                deltas[self._committed(obj, fk)] -= self._committed_value(obj)
+        for obj in session.dirty:
+            if isinstance(obj, self.child):
+                fk_history = inspect(obj).attrs[fk].history
+                value_changed = self.summed is not None and inspect(obj).attrs[self.summed.key].history.has_changes()
+                if fk_history.has_changes() or value_changed:
+                    deltas[self._committed(obj, fk)] -= self._committed_value(obj)
+                    deltas[getattr(obj, fk)] += self._value(obj)
+        deltas.pop(None, None)
+        return {k: v for k, v in deltas.items() if v != 0}
+
+    def _committed(self, obj, key):
+        """Returns the value of attribute key as last loaded from the database."""
+        history = inspect(obj).attrs[key].history
+        if history.deleted:
+            return history.deleted[0]
+        return history.unchanged[0] if history.unchanged else None
+
+    def _committed_value(self, obj):
+        if self.summed is None:
+            return 1
+        return self._value(obj, self._committed(obj, self.summed.key))
+
+    def apply(self, connection, deltas):
+        """Increment the parent rows' aggregate, one UPDATE per distinct change."""
+        by_delta = defaultdict(list)
+        for parent_id, delta in deltas.items():
+            by_delta[delta].append(parent_id)
+        column = self.target.expression
+        for delta, parent_ids in by_delta.items():
+            stmt = update(self.parent.__table__) \
+                .where(self.parent_key.in_(parent_ids)) \
+                .values({column.key: func.coalesce(column, 0) + delta})
+            connection.execute(stmt)
+
+    def recompute_expression(self):
+        """Returns a correlated subquery computing the aggregate from the child table."""
+        measure = func.count() if self.summed is None else func.coalesce(func.sum(self.summed), 0)
+        return select(measure) \
+            .where(self.foreign_key == self.parent_key) \
+            .correlate_except(self.child.__table__) \
+            .scalar_subquery()
+
+    def rebuild(self, session: Session, batch_size=1000, parent_ids=None):
+        """Recompute the aggregate for every parent row, or only the rows in parent_ids, in batches of primary
+        keys, committing each batch.  Yields the number of parent rows updated by each batch."""
+        column = self.target.expression
+        if parent_ids is not None:
+            parent_ids = sorted(parent_ids)
+        last_id = None
+        while True:
+            if parent_ids is not None:
+                ids = parent_ids[:batch_size]
+                parent_ids = parent_ids[batch_size:]
+            else:
+                q = select(self.parent_key).order_by(self.parent_key).limit(batch_size)
+                if last_id is not None:
+                    q = q.where(self.parent_key > last_id)
+                ids = [row[0] for row in session.execute(q)]
+            if not ids:
+                break
+            stmt = update(self.parent.__table__) \
+                .where(self.parent_key.in_(ids)) \
+                .values({column.key: self.recompute_expression()})
+            session.execute(stmt)
+            session.commit()
+            last_id = ids[-1]
+            yield len(ids)
+
+
+@event.listens_for(Session, "after_flush")
+def _maintain_aggregates(session: Session, flush_context):
+    # The session's new/dirty/deleted collections and attribute histories still show the pre-flush state
+    # here, while foreign keys of new rows have been populated by the flush.
+    for aggregate in MaintainedAggregate.registry:
+        deltas = aggregate.deltas(session)
+        if deltas:
+            aggregate.apply(session.connection(), deltas)
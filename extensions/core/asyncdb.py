@@ -0,0 +1,80 @@
+"""
+Identification
+    Module:     asyncdb.py
+    Author:     Victor Puska
+    Written:    Oct 19, 2026
+    Copyright:  (c) 2026 by VICTOR PUSKA.
+    License:    LICENSE_NAME, see LICENSE_FILE for more details.
+
+Description
+    Async engine and sessions for the async grid views, over an async driver (aiosqlite, aiomysql or
+    asyncpg).  Requires the optional greenlet package, an async driver and Flask's async support (asgiref).
+"""
+
+import threading
+
+from flask import Flask
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import NullPool
+
+try:
+    import asgiref
+    import greenlet
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+except ImportError:
+    asgiref = greenlet = None
+
+
+# Async drivers used for the sync database url's backend when SQLALCHEMY_ASYNC_DATABASE_URI is not set.
+ASYNC_DRIVERS = {'sqlite': 'aiosqlite', 'mysql': 'aiomysql', 'postgresql': 'asyncpg'}
+
+
+def available():
+    """True if the packages needed by the async views are installed."""
+    return greenlet is not None and asgiref is not None
+
+
+def async_url(url):
+    """Returns the database url with the backend's async driver."""
+    url = make_url(url)
+    backend = url.get_backend_name()
+    assert backend in ASYNC_DRIVERS, "No async driver for database backend: %s" % backend
+    return url.set(drivername="%s+%s" % (backend, ASYNC_DRIVERS[backend]))
+
+
+class AsyncDatabase(object):
+    """The async engine of the application, created on first use from SQLALCHEMY_ASYNC_DATABASE_URI (by
+    default the application's database with an async driver) and ASYNC_SQLALCHEMY_ENGINE_OPTIONS.
+
+    Flask runs each async view in an event loop of its own and pooled async connections cannot be shared
+    between loops, so connections are not pooled unless the options set a poolclass.
+    """
+
+    def __init__(self):
+        self.app: Flask = None
+        self._engine = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app: Flask):
+        app.config.setdefault('SQLALCHEMY_ASYNC_DATABASE_URI', None)
+        app.config.setdefault('ASYNC_SQLALCHEMY_ENGINE_OPTIONS', {})
+        with self._lock:
+            self.app = app
+            self._engine = None     # Created from the new application's config on first use
+
+    @property
+    def engine(self):
+        with self._lock:
+            if self._engine is None:
+                config = self.app.config
+                url = config['SQLALCHEMY_ASYNC_DATABASE_URI'] or async_url(config['SQLALCHEMY_DATABASE_URI'])
+                options = dict(config['ASYNC_SQLALCHEMY_ENGINE_OPTIONS'])
+                options.setdefault('poolclass', NullPool)
+                self._engine = create_async_engine(url, **options)
+            return self._engine
+
+    def session(self) -> 'AsyncSession':
+        return AsyncSession(self.engine, expire_on_commit=False)
+
+
+async_db = AsyncDatabase()
@@ -0,0 +1,170 @@
+"""
+Identification
+    Module:     asyncgrid.py
+    Author:     Victor Puska
+    Written:    Oct 19, 2026
+    Copyright:  (c) 2026 by VICTOR PUSKA.
+    License:    LICENSE_NAME, see LICENSE_FILE for more details.
+
+Description
+    Asyncio counterpart of W2GridView.  The grid views' W2Column definitions, query planning, searches and
+    caches are shared with the sync views; statements are executed on an AsyncSession (see asyncdb).
+"""
+
+import asyncio
+import json
+from typing import List
+
+from flask import request, jsonify, current_app, abort, g
+from sqlalchemy.exc import SQLAlchemyError
+
+from . core import blueprint
+from . asyncdb import async_db, available
+from . routing import stick
+from . grid import W2GridView, UserView, ItemsView, grid_views, grid_cache, lookup_cache, GRID_COMMANDS
+
+
+class AsyncW2GridView(W2GridView):
+    """W2GridView whose requests await the database.  The page's count and rows are read concurrently on two
+    connections.  Exports and jobs stream or run from the sync session as in W2GridView.
+
+    Async views always read the primary database (async_db has no replica engine).  Their writes start the
+    user's read-your-writes window, so the sync views' replica reads see them."""
+
+    def dispatch_request(self, *args, **kwargs):
+        if not available():
+            abort(501, "Async grid views require the greenlet package and an async database driver")
+        return super().dispatch_request(*args, **kwargs)
+
+    async def get(self, field=None, fmt=None):
+        if field is not None:
+            return await self.lookup(field)
+        return super().get(fmt=fmt)
+
+    async def post(self):
+        w2req = json.loads(request.form['request'])
+        w2cmd: str = w2req.get('cmd', None)
+        g.grid_cmd = w2cmd if w2cmd in GRID_COMMANDS else 'other'      # Label of the request's metrics
+        if w2cmd == 'get':
+            return await self.list(w2req)
+        elif w2cmd == 'save':
+            return await self.save(w2req)
+        elif w2cmd == 'delete':
+            return await self.delete(w2req)
+        elif w2cmd == 'facets':
+            return await self.facets(w2req)
+        elif w2cmd == 'job':
+            return self.submit_job(w2req)
+
+    async def delete(self, w2req):
+        rowids = w2req.get('selected', None)
+        async with async_db.session() as s:
+            try:
+                for rowid in rowids:
+                    if rowid > 0:
+                        dbrec = await s.get(self.model, rowid)
+                        if dbrec is not None:
+                            await s.delete(dbrec)
+                await s.commit()
+                stick()
+                self.invalidate_cache()
+                return jsonify(dict(status="success"))
+            except SQLAlchemyError as e:
+                await s.rollback()
+                return jsonify(dict(status="error", message=str(e)))
+
+    async def save(self, w2req):
+        w2changes: List = w2req.get('changes', None)
+        pkey = self.primarycol.model_column
+        updates = []
+        async with async_db.session() as s:
+            try:
+                for row in w2changes:
+                    recid = row['recid']
+                    record = self.model() if recid < 0 else await s.get(self.model, recid)
+                    self.apply_changes(record, row)
+                    if recid < 0:
+                        s.add(record)
+                    await s.flush()
+                    rowid = getattr(record, pkey.key)
+                    result = await s.execute(self.query.filter(pkey == rowid).statement)
+                    updates.append(dict(recid=recid, record=self.row_as_dict(result.first())))
+                await s.commit()
+                stick()
+                self.invalidate_cache()
+                return jsonify(dict(status="success", updates=updates))
+            except SQLAlchemyError as e:
+                await s.rollback()
+                return jsonify(dict(status="error", message=str(e)))
+
+    async def list(self, w2req):
+        w2limit: int = w2req.get('limit', None)
+        w2offset: int = w2req.get('offset', None)
+        w2columns = w2req.get('columns', None)
+
+        if isinstance(w2columns, list):
+            self.project(w2columns, w2req.get('search', None))
+        q = self.search_query(w2req)
+        page = q.order_by(self.primarycol.model_column)
+        if w2offset or w2limit is not None:
+            page = page.offset(w2offset or 0).limit(w2limit)
+        (total, summary), records = await asyncio.gather(self.totals(q, w2req), self.records(page.statement))
+
+        result = dict(status='success', total=total, records=records)
+        if summary is not None:
+            result['summary'] = [summary]
+        return jsonify(result)
+
+    async def records(self, statement):
+        """Returns the rows of statement as w2ui records, fetched W2GRID_FETCH_BATCH rows at a time."""
+        batch_size = current_app.config.get('W2GRID_FETCH_BATCH', 500)
+        records = []
+        async with async_db.session() as s:
+            result = await s.stream(statement.execution_options(yield_per=batch_size))
+            async for rows in result.partitions():
+                records.extend(self.row_as_dict(datarow) for datarow in rows)
+        return records
+
+    async def totals(self, q, w2req):
+        key = (self.view.__tablename__, 'totals', self.search_key(w2req))
+        cached = grid_cache.get(key)
+        if cached is None:
+            async with async_db.session() as s:
+                cached = self.totals_result((await s.execute(self.totals_query(q).statement)).one())
+            grid_cache.set(key, cached, current_app.config.get('W2GRID_CACHE_TTL', None))
+        return cached
+
+    async def facets(self, w2req):
+        key = (self.view.__tablename__, 'facets', self.search_key(w2req))
+        facets = grid_cache.get(key)
+        if facets is None:
+            counts = []
+            if self.facetcols:
+                statement, decode = self.facet_statement(self.search_query(w2req), async_db.engine.dialect.name)
+                async with async_db.session() as s:
+                    counts = [decode(row) for row in await s.execute(statement)]
+            facets = self.facets_result(counts)
+            grid_cache.set(key, facets, current_app.config.get('W2GRID_CACHE_TTL', None))
+        return jsonify(dict(status='success', facets=facets))
+
+    async def lookup(self, field):
+        key, q = self.lookup_query(field)
+        records = lookup_cache.get(key)
+        if records is None:
+            async with async_db.session() as s:
+                records = [dict(id=key_value, text=text) for key_value, text in await s.execute(q.statement)]
+            lookup_cache.set(key, records, current_app.config.get('W2GRID_CACHE_TTL', None))
+        return jsonify(dict(status='success', records=records))
+
+
+def add_async_grid_rules(bp, rule: str, endpoint: str, view, **kwargs):
+    """Register an AsyncW2GridView of view class 'view' at url 'rule', with its lookup and export urls."""
+    grid_views[endpoint] = (view, kwargs)
+    view_func = AsyncW2GridView.as_view(endpoint, view=view, endpoint=endpoint, **kwargs)
+    bp.add_url_rule(rule, view_func=view_func, methods=['GET', 'POST'])
+    bp.add_url_rule(rule + '/lookup/<field>', endpoint=endpoint + '_lookup', view_func=view_func, methods=['GET'])
+    bp.add_url_rule(rule + '/export.<fmt>', endpoint=endpoint + '_export', view_func=view_func, methods=['GET'])
+
+
+add_async_grid_rules(blueprint, '/async/users', 'async_edit', UserView, editable=True)
+add_async_grid_rules(blueprint, '/async/items', 'async_items', ItemsView, editable=True)
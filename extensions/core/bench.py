@@ -0,0 +1,153 @@
+"""
+Identification
+    Module:     bench.py
+    Author:     Victor Puska
+    Written:    Oct 19, 2026
+    Copyright:  (c) 2026 by VICTOR PUSKA.
+    License:    LICENSE_NAME, see LICENSE_FILE for more details.
+
+Description
+    Benchmarks of the grid hot paths (list, serialization, save, delete and page rendering) against a seeded
+    local SQLite database, with JSON baselines and regression comparison.
+"""
+
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Callable
+
+from flask import Flask
+
+from . database import db, session, User
+from . core import init_core
+from . seed import Seeder
+from . import grid
+
+
+PAGE_SIZES = [10, 100, 1000]
+
+SEARCHES = {
+    'none': None,
+    'contains': [dict(field='code', operator='contains', value='00')],
+    'is': [dict(field='type', operator='is', value='ADMIN')],
+    'between': [dict(field='id', operator='between', value=[100, 5000])],
+}
+
+
+def bench_app(path, users=10000, items=100000, reseed=False) -> Flask:
+    """Returns an application using the SQLite database at path, seeded with users and items if the
+    database does not exist yet (or reseed is set).  init_core binds the package's singletons (job queue,
+    hasher, throttle, metrics...) to the new application, so a process that already serves an application
+    should use it through isolated instead."""
+    app = Flask(__name__)
+    app.config.update(SQLALCHEMY_DATABASE_URI="sqlite:///" + os.path.abspath(path),
+                      SQLALCHEMY_TRACK_MODIFICATIONS=False,
+                      SECRET_KEY="bench",
+                      WTF_CSRF_ENABLED=False,
+                      W2GRID_CACHE_TTL=0)
+    init_core(app)
+    with app.app_context():
+        if reseed or not os.path.exists(path) or os.path.getsize(path) == 0:
+            db.drop_all()
+            db.create_all()
+            seeder = Seeder(seed=0)
+            seeder.seed_items(items, seeder.seed_users(users))
+    return app
+
+
+def isolated(path, f: Callable, *args, users=10000, items=100000, reseed=False):
+    """Returns f(app, *args) for the bench_app of the database at path, computed in a spawned process so that
+    the singletons of the current process stay bound to its own application.  f and args must be picklable."""
+    with ProcessPoolExecutor(1, mp_context=multiprocessing.get_context('spawn')) as pool:
+        return pool.submit(_call_isolated, path, users, items, reseed, f, args).result()
+
+
+def _call_isolated(path, users, items, reseed, f, args):
+    return f(bench_app(path, users, items, reseed), *args)
+
+
+def measure(f: Callable, repeat=20, warmup=2) -> Dict:
+    """Time f() and return the median, minimum and maximum in milliseconds."""
+    for _ in range(warmup):
+        f()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        f()
+        times.append((time.perf_counter() - start) * 1000.0)
+    return dict(median_ms=statistics.median(times), min_ms=min(times), max_ms=max(times), runs=repeat)
+
+
+def run(app: Flask, repeat=20) -> Dict:
+    """Run all benchmarks, returns a dictionary of results keyed by benchmark name."""
+    results = {}
+    client = app.test_client()
+
+    def post(url, w2req):
+        response = client.post(url, data={'request': json.dumps(w2req)})
+        assert response.status_code == 200 and response.get_json()['status'] == 'success', response.data[:200]
+
+    # Grid list, uncached, by page size and search type
+    for name, search in SEARCHES.items():
+        for size in PAGE_SIZES:
+            w2req = dict(cmd='get', limit=size, offset=0)
+            if search is not None:
+                w2req.update(search=search, searchLogic='AND')
+            results['list/%s/%d' % (name, size)] = measure(lambda: post('/users', w2req), repeat)
+
+    with app.test_request_context():
+        view = grid.grid_view('edit')
+        rows = view.query.order_by(view.primarycol.model_column).limit(1000).all()
+        # Row serializer, per 1000 rows
+        results['serialize/1000'] = measure(lambda: [view.row_as_dict(r) for r in rows], repeat)
+
+    # Page rendering
+    results['render/users'] = measure(lambda: client.get('/users'), repeat)
+
+    # Save and delete batches of 100 rows: insert new rows, update them, then delete them.
+    batches = []
+
+    def insert():
+        changes = [dict(recid=-(n + 1), code='bench%d_%d' % (len(batches), n), name='Bench') for n in range(100)]
+        response = client.post('/users', data={'request': json.dumps(dict(cmd='save', changes=changes))})
+        batches.append([u['record']['id'] for u in response.get_json()['updates']])
+
+    results['insert/100'] = measure(insert, repeat, warmup=0)
+    ids = iter(batches)
+    results['update/100'] = measure(
+        lambda: post('/users', dict(cmd='save', changes=[dict(recid=i, name='Bench %d' % i) for i in next(ids)])),
+        repeat, warmup=0)
+    ids = iter(batches)
+    results['delete/100'] = measure(lambda: post('/users', dict(cmd='delete', selected=next(ids))), repeat, warmup=0)
+    return results
+
+
+def run_report(app: Flask, repeat=20) -> Dict:
+    """Run all benchmarks and return their report."""
+    return report(app, run(app, repeat))
+
+
+def report(app: Flask, results: Dict) -> Dict:
+    """Wrap results with the environment they were measured in."""
+    with app.app_context():
+        rows = session.query(User).count()
+    return dict(meta=dict(python=platform.python_version(), platform=platform.platform(), users=rows,
+                          created=time.strftime("%Y-%m-%dT%H:%M:%S")),
+                results=results)
+
+
+def compare(baseline: Dict, current: Dict, threshold=0.10):
+    """Compare two reports.  Returns a list of tuples (name, baseline ms, current ms, change, regressed)
+    for the benchmarks in both reports; a benchmark regressed if its median grew by more than threshold."""
+    rows = []
+    for name, base in sorted(baseline['results'].items()):
+        cur = current['results'].get(name, None)
+        if cur is None:
+            continue
+        change = cur['median_ms'] / base['median_ms'] - 1.0 if base['median_ms'] else 0.0
+        rows.append((name, base['median_ms'], cur['median_ms'], change, change > threshold))
+    return rows
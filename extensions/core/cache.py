@@ -0,0 +1,82 @@
+"""
+Identification
+    Module:     cache.py
+    Author:     Victor Puska
+    Written:    Oct 19, 2026
+    Copyright:  (c) 2026 by VICTOR PUSKA.
+    License:    LICENSE_NAME, see LICENSE_FILE for more details.
+
+Description
+    Small in-process caches shared by the grid views.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache(object):
+    """A thread safe, size bounded LRU cache whose entries expire after ``ttl`` seconds.
+
+    The cache is local to the worker process.  Entries are evicted least recently used first once
+    ``maxsize`` is reached, and an expired entry is treated as missing the next time it is read.
+    """
+
+    _MISSING = object()
+
+    def __init__(self, maxsize=256, ttl=30.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()      # key -> (expiry time, value)
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """Return the cached value for ``key`` or ``default`` if missing or expired."""
+        with self._lock:
+            entry = self._data.get(key, self._MISSING)
+            if entry is self._MISSING:
+                return default
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        """Store ``value`` under ``key``.  ``ttl`` overrides the cache's default time to live."""
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_set(self, key, factory, ttl=None):
+        """Return the cached value for ``key``, calling ``factory()`` to compute and store it when missing."""
+        value = self.get(key, self._MISSING)
+        if value is self._MISSING:
+            value = factory()
+            self.set(key, value, ttl)
+        return value
+
+    def pop(self, key, default=None):
+        """Remove the entry for ``key`` and return its value, or ``default`` if missing or expired."""
+        with self._lock:
+            entry = self._data.pop(key, self._MISSING)
+        if entry is self._MISSING or entry[0] < time.monotonic():
+            return default
+        return entry[1]
+
+    def discard(self, predicate):
+        """Remove every entry whose key satisfies ``predicate(key)``."""
+        with self._lock:
+            for key in [k for k in self._data if predicate(k)]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
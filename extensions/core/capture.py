@@ -0,0 +1,169 @@
+"""
+Identification
+    Module:     capture.py
+    Author:     Victor Puska
+    Written:    Oct 19, 2026
+    Copyright:  (c) 2026 by VICTOR PUSKA.
+    License:    LICENSE_NAME, see LICENSE_FILE for more details.
+
+Description
+    Opt-in recording of anonymized w2ui grid requests to a rotating JSONL file, and replay of a recording
+    against a local application to compare latency distributions.
+"""
+
+import hashlib
+import json
+import logging
+import logging.handlers
+import os
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable
+
+from flask import Flask, request, g
+
+from . loadtest import percentile
+
+
+REPLAY_HEADER = 'X-Core-Replay'    # Marks replayed requests, which are never recorded
+
+
+class TrafficRecorder(object):
+    """Records every request carrying a w2ui 'request' parameter.  Enabled by setting CAPTURE_FILE, the file
+    is rotated after CAPTURE_MAX_BYTES with CAPTURE_BACKUPS old files kept.
+
+    Strings in searches and changes are replaced by keyed hashes of the same length, so that captures keep
+    the shape of the users' queries (fields, operators, value lengths, paging) without their data.
+    """
+
+    def __init__(self, app: Flask = None):
+        self.logger = None
+        self.key = b''
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask):
+        path = app.config.get('CAPTURE_FILE', None)
+        if not path:
+            return
+        handler = logging.handlers.RotatingFileHandler(path, maxBytes=app.config.get('CAPTURE_MAX_BYTES', 10 << 20),
+                                                       backupCount=app.config.get('CAPTURE_BACKUPS', 5))
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        self.logger = logging.getLogger('core.capture.%s' % app.name)
+        self.logger.propagate = False
+        self.logger.setLevel(logging.INFO)
+        self.logger.addHandler(handler)
+        self.key = app.config.get('CAPTURE_KEY', app.config.get('SECRET_KEY', '')).encode()[:64]
+        app.before_request(self.before_request)
+        app.after_request(self.after_request)
+
+    def before_request(self):
+        g.capture_start = time.perf_counter()
+
+    def after_request(self, response):
+        w2req = request.form.get('request', None) if request.method == 'POST' else request.args.get('request', None)
+        if w2req is not None and 'capture_start' in g and REPLAY_HEADER not in request.headers:
+            try:
+                w2req = self.anonymize(json.loads(w2req))
+            except ValueError:
+                return response
+            record = dict(ts=time.time(), method=request.method, path=request.path, endpoint=request.endpoint,
+                          cmd=w2req.get('cmd', None), request=w2req, status=response.status_code,
+                          size=response.calculate_content_length())
+            start = g.capture_start
+
+            # The duration includes sending the body, which is when streamed responses do their work.
+            def log():
+                record['duration_ms'] = (time.perf_counter() - start) * 1000.0
+                self.logger.info(json.dumps(record))
+            response.call_on_close(log)
+        return response
+
+    def pseudonym(self, value: str) -> str:
+        digest = hashlib.blake2b(value.encode(), key=self.key, digest_size=32).hexdigest()
+        return (digest * (len(value) // len(digest) + 1))[:len(value)]
+
+    def anonymize(self, w2req: Dict) -> Dict:
+        def scrub(value):
+            if isinstance(value, str):
+                return self.pseudonym(value)
+            elif isinstance(value, list):
+                return [scrub(v) for v in value]
+            elif isinstance(value, dict):
+                return {k: scrub(v) for k, v in value.items()}
+            return value
+
+        w2req = dict(w2req)
+        if 'search' in w2req:
+            w2req['search'] = [dict(d, value=scrub(d.get('value', None))) for d in w2req['search'] or []]
+        if 'changes' in w2req:
+            w2req['changes'] = [{k: v if k == 'recid' else scrub(v) for k, v in row.items()}
+                                for row in w2req['changes'] or []]
+        return w2req
+
+
+def read_capture(path) -> Iterable[Dict]:
+    """Yields the records of a capture file and its rotated backups, oldest first."""
+    backups = []
+    n = 1
+    while os.path.exists("%s.%d" % (path, n)):
+        backups.append("%s.%d" % (path, n))
+        n += 1
+    for name in list(reversed(backups)) + [path]:
+        with open(name) as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def replay(app: Flask, records: Iterable[Dict], speed=1.0, concurrency=8, commands=('get',)) -> Dict:
+    """Replay captured requests against app through the test client.  Requests are issued at their recorded
+    offsets divided by speed (speed 0 sends them as fast as possible) on a pool of concurrency threads.
+    Returns {(path, cmd): {'recorded': [ms], 'replayed': [ms], 'errors': n}}."""
+    results = defaultdict(lambda: dict(recorded=[], replayed=[], errors=0))
+    lock = threading.Lock()
+    local = threading.local()
+
+    def send(record):
+        client = getattr(local, 'client', None)
+        if client is None:
+            client = local.client = app.test_client()
+        data = {'request': json.dumps(record['request'])}
+        headers = {REPLAY_HEADER: '1'}
+        start = time.perf_counter()
+        if record['method'] == 'POST':
+            response = client.post(record['path'], data=data, headers=headers)
+        else:
+            response = client.get(record['path'], query_string=data, headers=headers)
+        response.get_data()     # Read streamed responses to the end, as the recorded durations do
+        response.close()
+        elapsed = (time.perf_counter() - start) * 1000.0
+        with lock:
+            r = results[(record['path'], record['cmd'])]
+            r['recorded'].append(record['duration_ms'])
+            r['replayed'].append(elapsed)
+            if response.status_code >= 400:
+                r['errors'] += 1
+
+    records = [r for r in records if not commands or r['cmd'] in commands]
+    with ThreadPoolExecutor(concurrency) as pool:
+        first = None
+        start = time.monotonic()
+        for record in records:
+            if first is None:
+                first = record['ts']
+            if speed:
+                delay = (record['ts'] - first) / speed - (time.monotonic() - start)
+                if delay > 0:
+                    time.sleep(delay)
+            pool.submit(send, record)
+    return dict(results)
+
+
+def latency_summary(values):
+    return dict(count=len(values), p50=percentile(values, 50), p95=percentile(values, 95), p99=percentile(values, 99))
+
+
+recorder = TrafficRecorder()
@@ -10,11 +10,20 @@ Description
     Authentication and authority management for the application.
 """
 
+import csv
+import json
+import time
+
 import click
 from flask import current_app, url_for, Flask
 from flask.cli import FlaskGroup
+from sqlalchemy.exc import SQLAlchemyError
 from . database import db, User, session
 from . util import get_routes
+from . aggregates import MaintainedAggregate
+from . jobs import job_queue
+from . import grid
+from . seed import Seeder
 
 
 core_cli: FlaskGroup = FlaskGroup()
@@ -53,6 +62,238 @@ def initdb():
     click.echo("Database initialised.")
 
 
+@core_cli_group.command("rebuild-aggregates")
+@click.option("--batch-size", default=1000, show_default=True, help="Parent rows updated per commit")
+def rebuild_aggregates(batch_size):
+    """Recompute the maintained aggregate columns"""
+    for aggregate in MaintainedAggregate.registry:
+        rows = 0
+        for count in aggregate.rebuild(session, batch_size):
+            rows += count
+        click.echo("{0}: {1} rows rebuilt.".format(aggregate.target, rows))
+
+
+@core_cli_group.command("import")
+@click.argument("view")
+@click.argument("file", type=click.File("r", encoding="utf-8-sig"))
+@click.option("--batch-size", default=5000, show_default=True, help="Rows per executemany batch and commit")
+@click.option("--upsert", is_flag=True, help="Update rows whose primary key already exists")
+def import_csv(view, file, batch_size, upsert):
+    """Bulk load a CSV file into a grid view's table.  VIEW is the grid's endpoint or table name, the CSV
+    headers are the view's field names or captions.  Blank cells take the column's default, or with --upsert
+    leave an existing row's value unchanged.  Of the rows repeating a primary key the last one is loaded."""
+    try:
+        g = grid.grid_view(view)
+    except KeyError:
+        raise click.BadParameter("No grid view named %s" % view, param_hint="VIEW")
+    reader = csv.reader(file)
+    headers = next(reader)
+    by_caption = {w2col.caption: field for field, w2col in g.w2columns.items() if w2col.caption}
+    fields = []
+    for header in headers:
+        field = header if header in g.w2columns else by_caption.get(header, None)
+        if field is None:
+            raise click.BadParameter("Unknown column %s" % header, param_hint="FILE")
+        fields.append(field)
+    # Related and aggregate columns are computed, they are never loaded.
+    loaded = [(i, field, g.w2columns[field].handler) for i, field in enumerate(fields)
+              if not g.w2columns[field].is_related and not g.w2columns[field].model_column.info.get('maintained')]
+
+    # Core inserts bypass the flush hooks of maintained aggregates, collect the parents to rebuild.
+    aggregates = [a for a in MaintainedAggregate.registry if a.child is g.model]
+    parents = {a: set() for a in aggregates}
+
+    def records():
+        for row in reader:
+            # Blank cells are left out, so that they take the column's default
+            record = {}
+            for i, field, handler in loaded:
+                try:
+                    if row[i] != '':
+                        record[field] = handler.from_json(row[i])
+                except IndexError:
+                    raise click.ClickException("Line {0}: no value for {1}".format(reader.line_num, headers[i]))
+                except (ValueError, TypeError) as e:
+                    raise click.ClickException("Line {0}: bad value for {1}: {2!r} ({3})".format(
+                        reader.line_num, headers[i], row[i], e))
+            for aggregate, parent_ids in parents.items():
+                for field, value in record.items():
+                    if g.w2columns[field].model_column.key == aggregate.foreign_key.key and value is not None:
+                        parent_ids.add(value)
+            yield record
+
+    start = time.perf_counter()
+    total = 0
+    committed = reader.line_num     # Last line of the last committed batch
+    try:
+        for count in g.bulk_load(records(), batch_size, upsert):
+            committed = reader.line_num
+            total += count
+            elapsed = time.perf_counter() - start
+            click.echo("{0} rows, {1:.0f} rows/s".format(total, total / elapsed if elapsed else 0))
+    except SQLAlchemyError as e:
+        session.rollback()
+        raise click.ClickException("Lines {0} to {1} failed ({2} rows were imported): {3}".format(
+            committed + 1, reader.line_num, total, getattr(e, 'orig', None) or e))
+    for aggregate, parent_ids in parents.items():
+        # An upsert may also have moved rows away from other parents, rebuild them all.
+        for _ in aggregate.rebuild(session, parent_ids=None if upsert else parent_ids):
+            pass
+        click.echo("{0} rebuilt.".format(aggregate.target))
+    elapsed = time.perf_counter() - start
+    click.echo("Imported {0} rows in {1:.1f}s ({2:.0f} rows/s).".format(total, elapsed, total / elapsed if elapsed else 0))
+
+
+@core_cli_group.command()
+@click.option("--users", default=10000, show_default=True, help="Number of users to create")
+@click.option("--items", default=100000, show_default=True, help="Number of items to create")
+@click.option("--seed", default=0, show_default=True, help="Random seed, the same seed creates the same rows")
+@click.option("--name-length", default="5-30", show_default=True, help="Range of name lengths, MIN-MAX")
+@click.option("--types", default=3, show_default=True, help="Number of distinct user types")
+@click.option("--days", default=365, show_default=True, help="Created dates are spread over this many days")
+@click.option("--dates", type=click.Choice(['uniform', 'recent']), default='uniform', show_default=True,
+              help="Distribution of created dates")
+@click.option("--owners", default=None, type=int, help="Number of distinct users owning items [all]")
+@click.option("--skew", default=0.0, show_default=True, help="Zipf exponent of items per owner, 0 is even")
+@click.option("--batch-size", default=500, show_default=True, help="Rows per INSERT statement")
+def seed(users, items, seed, name_length, types, days, dates, owners, skew, batch_size):
+    """Create synthetic users and items for benchmarking"""
+    low, high = (int(n) for n in name_length.split("-"))
+    seeder = Seeder(seed=seed, name_length=(low, high), types=types, days=days, dates=dates, owners=owners,
+                    skew=skew, batch_size=batch_size)
+    start = time.perf_counter()
+    user_ids = seeder.seed_users(users)
+    click.echo("{0} users created in {1:.1f}s.".format(len(user_ids), time.perf_counter() - start))
+    start = time.perf_counter()
+    seeder.seed_items(items, user_ids)
+    click.echo("{0} items created in {1:.1f}s.".format(items, time.perf_counter() - start))
+
+
+@core_cli_group.command()
+@click.option("--database", default="bench.db", show_default=True, help="SQLite database file to benchmark")
+@click.option("--users", default=10000, show_default=True, help="Users seeded into a new database")
+@click.option("--items", default=100000, show_default=True, help="Items seeded into a new database")
+@click.option("--reseed", is_flag=True, help="Recreate and reseed the database")
+@click.option("--repeat", default=20, show_default=True, help="Timed runs per benchmark")
+@click.option("--output", type=click.Path(), default=None, help="Write the results to this JSON file")
+def bench(database, users, items, reseed, repeat, output):
+    """Benchmark the grid hot paths against a seeded SQLite database"""
+    from . import bench as benchmarks
+    results = benchmarks.isolated(database, benchmarks.run_report, repeat, users=users, items=items, reseed=reseed)
+    for name, r in sorted(results['results'].items()):
+        click.echo("{0:24} {1:9.2f} ms  (min {2:.2f}, max {3:.2f})".format(name, r['median_ms'], r['min_ms'],
+                                                                          r['max_ms']))
+    if output:
+        with open(output, "w") as f:
+            json.dump(results, f, indent=2)
+        click.echo("Results written to {0}.".format(output))
+
+
+@core_cli_group.command("bench-compare")
+@click.argument("baseline", type=click.File("r"))
+@click.argument("current", type=click.File("r"))
+@click.option("--threshold", default=0.10, show_default=True, help="Median slowdown flagged as a regression")
+def bench_compare(baseline, current, threshold):
+    """Compare benchmark results with a baseline, exits with status 1 on regressions"""
+    from . import bench as benchmarks
+    rows = benchmarks.compare(json.load(baseline), json.load(current), threshold)
+    for name, base, cur, change, regressed in rows:
+        click.echo("{0:24} {1:9.2f} {2:9.2f} ms {3:+7.1%} {4}".format(name, base, cur, change,
+                                                                      "REGRESSION" if regressed else ""))
+    regressions = sum(1 for row in rows if row[4])
+    click.echo("{0} regression(s).".format(regressions))
+    if regressions:
+        raise SystemExit(1)
+
+
+@core_cli_group.command()
+@click.option("--database", default=None, help="Run against this seeded SQLite file instead of the app's database")
+@click.option("--url", default="/users", show_default=True, help="Grid url")
+@click.option("--mix", default=None, help="Weighted request mix [page=5,list=75,save=15,delete=5]")
+@click.option("--concurrency", default=4, show_default=True, help="Number of workers")
+@click.option("--mode", type=click.Choice(['thread', 'process']), default='thread', show_default=True)
+@click.option("--duration", default=10.0, show_default=True, help="Seconds to run")
+@click.option("--page-size", default=100, show_default=True, help="Rows per list request")
+@click.option("--seed", default=0, show_default=True, help="Random seed of the workers")
+def loadtest(database, url, mix, concurrency, mode, duration, page_size, seed):
+    """Drive a grid with concurrent in-process requests"""
+    from . import loadtest as load
+    mix = load.parse_mix(mix or load.DEFAULT_MIX)
+    args = (mix, url, page_size, seed, concurrency, duration, mode)
+    try:
+        if database is None:
+            r = load.drive(current_app._get_current_object(), *args)
+        else:
+            from . bench import isolated
+            r = isolated(database, load.drive, *args)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--url")
+    click.echo("{requests} requests in {elapsed:.1f}s: {rps:.1f} req/s, {errors} errors, "
+               "{statements_per_request:.2f} statements/request".format(**r))
+    click.echo("{0:8} {1:>8} {2:>9} {3:>9} {4:>9}".format("", "count", "p50 ms", "p95 ms", "p99 ms"))
+    for op, o in sorted(r['operations'].items()):
+        click.echo("{0:8} {count:8} {p50:9.2f} {p95:9.2f} {p99:9.2f}".format(op, **o))
+
+
+@core_cli_group.command()
+@click.argument("capture", type=click.Path(exists=True))
+@click.option("--database", default=None, help="Replay against this seeded SQLite file instead of the app's database")
+@click.option("--speed", default=1.0, show_default=True, help="Pace multiplier, 0 replays as fast as possible")
+@click.option("--concurrency", default=8, show_default=True, help="Concurrent replay threads")
+@click.option("--commands", default="get,facets", show_default=True, help="w2ui commands to replay")
+def replay(capture, database, speed, concurrency, commands):
+    """Replay a grid traffic capture and compare latencies"""
+    from . import capture as captures
+    args = (list(captures.read_capture(capture)), speed, concurrency, commands.split(","))
+    if database is None:
+        results = captures.replay(current_app._get_current_object(), *args)
+    else:
+        from . bench import isolated
+        results = isolated(database, captures.replay, *args)
+    click.echo("{0:30} {1:>6} {2:>19} {3:>19} {4:>19}".format("", "count", "p50 ms rec/replay",
+                                                            "p95 ms rec/replay", "p99 ms rec/replay"))
+    for (path, cmd), r in sorted(results.items(), key=lambda item: str(item[0])):
+        rec = captures.latency_summary(r['recorded'])
+        rep = captures.latency_summary(r['replayed'])
+        click.echo("{0:30} {1:6} {2:9.2f}/{3:<9.2f} {4:9.2f}/{5:<9.2f} {6:9.2f}/{7:<9.2f} {8}".format(
+            "%s %s" % (path, cmd), rec['count'], rec['p50'], rep['p50'], rec['p95'], rep['p95'], rec['p99'],
+            rep['p99'], "%d errors" % r['errors'] if r['errors'] else ""))
+
+
+@core_cli_group.command()
+def jobs():
+    """List background jobs."""
+    for state in job_queue.jobs():
+        click.echo("{id}  {name:8} {status:10} {created}  {done}/{total}  {message}".format(**state))
+
+
+@core_cli_group.command("cancel-job")
+@click.argument("id")
+def cancel_job(id):
+    """Cancel a queued or running background job"""
+    job = job_queue.job(id)
+    if job is None:
+        click.echo("No such job.")
+    else:
+        job.cancel()
+        click.echo("Job cancelled.")
+
+
+@core_cli_group.command("run-job")
+@click.argument("name")
+@click.argument("endpoint")
+@click.option("--search", default=None, help="w2ui search list as JSON")
+@click.option("--logic", default="AND", show_default=True, help="Search logic, AND or OR")
+def run_job(name, endpoint, search, logic):
+    """Run a grid job (xlsx, delete) in the foreground"""
+    w2req = dict(search=json.loads(search) if search else None, searchLogic=logic)
+    job = job_queue.create(name, endpoint=endpoint, w2req=w2req)
+    click.echo("Job {0} started.".format(job.id))
+    job_queue.run(job)
+    state = job.load()
+    click.echo("Job {0}: {1} {2}".format(state['status'], state.get('result') or '', state.get('message') or ''))
+
+
 @core_cli_group.command()
 def routes():
     """Show application routes."""
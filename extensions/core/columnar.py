@@ -0,0 +1,114 @@
+"""
+Identification
+    Module:     columnar.py
+    Author:     Victor Puska
+    Written:    Oct 19, 2026
+    Copyright:  (c) 2026 by VICTOR PUSKA.
+    License:    LICENSE_NAME, see LICENSE_FILE for more details.
+
+Description
+    Columnar (Apache Arrow IPC and Parquet) export of grid query results.  Requires the optional pyarrow
+    package.
+"""
+
+import io
+import mmap
+import os
+import tempfile
+from typing import Dict, Iterable
+
+from sqlalchemy.sql.sqltypes import Integer, DateTime, Boolean, Float, Numeric, Date
+from w2ui.definitions import W2Column
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+
+def available():
+    """True if pyarrow is installed."""
+    return pyarrow is not None
+
+
+# Precision and scale of the arrow decimal of a Numeric column declared without them.  The scale is the one
+# SQLAlchemy rounds such columns' Decimal values to.
+DECIMAL_PRECISION = 38
+DECIMAL_SCALE = 10
+
+
+def arrow_type(w2col: W2Column):
+    """Returns the arrow type for the SQLAlchemy type of a W2Column's expression.  Numeric columns returning
+    Decimal values map to decimals of the column's precision and scale, Float columns and Numeric columns with
+    asdecimal=False to doubles."""
+    t = w2col.expression.type
+    if isinstance(t, Boolean):
+        return pyarrow.bool_()
+    elif isinstance(t, Integer):
+        return pyarrow.int64()
+    elif isinstance(t, Float) or isinstance(t, Numeric) and not t.asdecimal:
+        return pyarrow.float64()
+    elif isinstance(t, Numeric):
+        return pyarrow.decimal128(t.precision or DECIMAL_PRECISION,
+                                  t.scale if t.scale is not None else DECIMAL_SCALE)
+    elif isinstance(t, DateTime):
+        return pyarrow.timestamp('us')
+    elif isinstance(t, Date):
+        return pyarrow.date32()
+    else:
+        return pyarrow.string()
+
+
+def arrow_schema(w2columns: Dict[str, W2Column]):
+    return pyarrow.schema([(field, arrow_type(w2col)) for field, w2col in w2columns.items()])
+
+
+def record_batches(rows: Iterable, schema, batch_size: int):
+    """Yields arrow record batches of up to batch_size rows built column-wise from database rows."""
+    columns = [[] for _ in schema]
+    count = 0
+    for row in rows:
+        for values, value in zip(columns, row):
+            values.append(value)
+        count += 1
+        if count == batch_size:
+            yield pyarrow.RecordBatch.from_arrays([pyarrow.array(v, type=f.type) for v, f in zip(columns, schema)],
+                                                  schema=schema)
+            columns = [[] for _ in schema]
+            count = 0
+    if count:
+        yield pyarrow.RecordBatch.from_arrays([pyarrow.array(v, type=f.type) for v, f in zip(columns, schema)],
+                                              schema=schema)
+
+
+def arrow_stream(rows: Iterable, schema, batch_size: int):
+    """Yields the bytes of an arrow IPC stream, the schema and then one message per record batch, as the rows
+    are read."""
+    sink = io.BytesIO()
+    writer = pyarrow.ipc.new_stream(sink, schema)
+    for batch in record_batches(rows, schema, batch_size):
+        writer.write_batch(batch)
+        yield sink.getvalue()
+        sink.seek(0)
+        sink.truncate()
+    writer.close()
+    yield sink.getvalue()
+
+
+def parquet_file(rows: Iterable, schema, batch_size: int, chunk_size=1 << 20):
+    """Writes the rows to a temporary parquet file, one row group per batch, and yields the file's contents
+    in chunks read from a memory map of the file.  The file is removed once it has been sent."""
+    fd, path = tempfile.mkstemp(suffix='.parquet')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            writer = pyarrow.parquet.ParquetWriter(f, schema)
+            for batch in record_batches(rows, schema, batch_size):
+                writer.write_batch(batch)
+            writer.close()
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            for offset in range(0, len(m), chunk_size):
+                yield m[offset:offset + chunk_size]
+    finally:
+        os.remove(path)
@@ -9,10 +9,22 @@ Identification
 Description
     Authentication and authority management for the application.
 """
-from flask import Flask, Blueprint
+from flask import Flask, Blueprint, current_app
 from flask_login import LoginManager
 from flask_migrate import Migrate
-from . database import db, User
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from . database import db, session, User, UserBase
+from . cache import TTLCache
+from . passwords import hasher
+from . throttle import login_throttle
+from . lastaccess import access_tracker
+from . metrics import request_metrics
+from . jobs import job_queue
+from . capture import recorder
+from . asyncdb import async_db
+from . pool import init_pool
+from . warmup import init_warmup
 
 
 login_manager = LoginManager()
@@ -23,15 +35,85 @@ blueprint = Blueprint('core', __name__,
 
 
 
+# Per worker cache of the principals of logged in users, keyed by user id
+user_cache = TTLCache(maxsize=4096)
+
+
+class UserPrincipal(object):
+    """The current_user of a request: the identity and authority of a user without an ORM instance."""
+    __slots__ = ('id', 'code', 'name', 'type', 'active')
+
+    is_authenticated = True
+    is_active = True
+    is_anonymous = False
+
+    def __init__(self, id, code, name, type, active):
+        self.id = id
+        self.code = code
+        self.name = name
+        self.type = type
+        self.active = active
+
+    def get_id(self):
+        return str(self.id)
+
+    def is_superuser(self):
+        return self.type == "SUPER"
+
+    def is_adminuser(self):
+        return (self.type == "SUPER") or (self.type == "ADMIN")
+
+    @classmethod
+    def load(cls, id):
+        row = session.query(User.id, User.code, User.name, User.type, User.active).filter(User.id == id).first()
+        return None if row is None else cls(*row)
+
+
 @login_manager.user_loader
 def load_user(id):
-    return User.query.get(id)
+    try:
+        id = int(id)
+    except ValueError:
+        return None
+    return user_cache.get_or_set(id, lambda: UserPrincipal.load(id), current_app.config.get('USER_CACHE_TTL', 60))
+
+
+@event.listens_for(Session, "after_flush")
+def _flushed_principals(session, flush_context):
+    # Users saved or deleted through the ORM (grid saves and deletes, CLI) are reloaded on their next request
+    # once the transaction has committed.  Discarding them at the flush would let a concurrent request cache
+    # the row as it was before the commit.
+    ids = [obj.id for obj in list(session.new) + list(session.dirty) + list(session.deleted)
+           if isinstance(obj, UserBase)]
+    if ids:
+        session.info.setdefault('principals', set()).update(ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _discard_principals(session):
+    for id in session.info.pop('principals', ()):
+        user_cache.pop(id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_principals(session):
+    session.info.pop('principals', None)
+
 
 def init_core(app: Flask):
     app.register_blueprint(blueprint)
+    init_pool(app)
     db.init_app(app)
     Migrate(app, db)
     login_manager.init_app(app)
+    job_queue.init_app(app)
+    recorder.init_app(app)
+    async_db.init_app(app)
+    hasher.init_app(app)
+    login_throttle.init_app(app)
+    access_tracker.init_app(app)
+    request_metrics.init_app(app)
+    init_warmup(app)
 
 
 
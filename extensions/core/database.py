@@ -15,14 +15,16 @@ import datetime
 from flask_sqlalchemy import SQLAlchemy
 from sqlalchemy import Column, Integer, String, Boolean, DateTime, ForeignKey
 from sqlalchemy.orm import Session, relationship
-from werkzeug.security import generate_password_hash, check_password_hash
 from flask_login import UserMixin
 from werkzeug.local import LocalProxy
 from sqlalchemy import inspect
 from w2ui.definitions import W2Column
+from . aggregates import MaintainedAggregate
+from . routing import RoutingSession
+from . passwords import hasher
 
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
 
 def sess():
@@ -51,13 +53,13 @@ class UserBase(db.Model, UserMixin):
         return (self.type == "SUPER") or (self.type == "ADMIN")
 
     def set_password(self, password):
-        self.password = generate_password_hash(password)
+        self.password = hasher.hash(password)
 
     def check_password(self, password):
         if self.password is None:
             return password == "hamish"
         else:
-            return check_password_hash(self.password, password)
+            return hasher.verify(self.password, password)
 
 
 W2Column.set_defaults(UserBase.name, caption="User Name", size=155)
@@ -69,6 +71,7 @@ class MyUserClass(UserBase):
     __table_args__ = {'extend_existing': True}
 
     items = relationship("Items", back_populates="user")
+    item_count = Column(Integer, default=0, server_default="0", nullable=False, index=True)
 
 
 User = MyUserClass
@@ -82,3 +85,6 @@ class Items(db.Model):
 
     user = relationship("MyUserClass", back_populates="items")
 
+
+# Number of items per user, maintained by the ORM flush (see core.aggregates)
+user_item_count = MaintainedAggregate(MyUserClass.item_count, Items.userid)
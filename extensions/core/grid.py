@@ -10,49 +10,98 @@ Description
     Authentication and authority management for the application. Saving comment xxxxx
 """
 
+import csv
+import io
 import json
+import os
 
 from typing import List, Dict
 
-from flask import render_template, url_for, session, request, jsonify, g, Response, current_app, Flask
+from flask import render_template, url_for, session, request, jsonify, g, Response, current_app, Flask, \
+    Blueprint, abort, stream_with_context
+from flask.json import dumps as json_dumps
 from flask.views import MethodView
 
+from sqlalchemy import inspect
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.sql import func, literal, null, union_all, bindparam
 from sqlalchemy.sql.operators import eq, ilike_op, gt, ge, between_op, or_, and_, contains_op
 
-from . database import session, User
-from . core import blueprint
+from . database import session, User, UserBase, Items
+from . core import blueprint, user_cache
+from . cache import TTLCache
+from . routing import on_replica
+from . import columnar
+from . jobs import job_queue, build_xlsx
 from w2ui.definitions import W2Column
 
 
+# Per worker cache of search results that are expensive to recompute (counts, summaries).  Keys are tuples
+# starting with the view's table name so that a view's entries can be discarded when its data changes.
+grid_cache = TTLCache(maxsize=512)
+
+# Per worker LRU cache of recent lookup searches.  Keys are tuples starting with the looked up table's name.
+lookup_cache = TTLCache(maxsize=1024)
+
+# Per worker cache of the queries of column projections requested by grid clients, keyed by the view's table
+# name, the projected fields and the related fields joined for searching.  Queries are cached without a session.
+projection_cache = TTLCache(maxsize=256, ttl=3600)
+
+# Grid views registered by add_grid_rules: endpoint -> (view class, W2GridView keyword arguments)
+grid_views = {}
+
+# Dialects that support GROUP BY GROUPING SETS, other dialects compute facets with UNION ALL.
+GROUPING_SETS_DIALECTS = ('postgresql', 'mssql', 'oracle')
+
+# Commands of w2ui grid requests, the label of a request's metrics (any other command is labelled 'other')
+GRID_COMMANDS = ('get', 'save', 'delete', 'facets', 'job')
+
+# Export formats served at a view's export url: format -> name of the W2GridView method writing it
+EXPORT_FORMATS = dict(csv='export_csv', arrow='export_arrow', parquet='export_parquet')
+
+
 class UserView:
-    edits = dict(type='combo', filter=False, items=[' ', 'ADMIN', 'SUPER'])
+    edits = dict(type='combo', filter=False, minLength=0)
 
-    id = W2Column(User.id, type='int')
+    id = W2Column(User.id, type='int', aggregate='count')
     code = W2Column(User.code, editable=True, operator='contains')
     name = W2Column(User.name, editable=True, operator='contains')
     email = W2Column(User.email, editable=True, operator='contains', size=100)
-    active = W2Column(User.active, editable=True, caption="Active")
-    type = W2Column(User.type, editable=edits, searchable=True, operator='is')
+    active = W2Column(User.active, editable=True, caption="Active", facet=True)
+    type = W2Column(User.type, editable=edits, searchable=True, operator='is', facet=True, lookup=True)
     created = W2Column(User.created, editable={'type': 'datetime'})
     lastaccess = W2Column(User.lastaccess, editable=True, render='datetime')
+    items = W2Column(User.item_count, caption="Items", size=50)
 
     __tablename__ = "Users"
 
 
+class ItemsView:
+    id = W2Column(Items.id, type='int')
+    name = W2Column(Items.name, editable=True, operator='contains')
+    userid = W2Column(Items.userid, editable=dict(type='list'), caption="User", lookup=User.code)
+    owner = W2Column(User.code, path=Items.user, caption="Owner", operator='contains')
+
+    __tablename__ = "Items"
+
+
 class W2GridView(MethodView):
 
     def __init__(self, **kwargs):
         self.view = kwargs.pop('view')
         self.editable = kwargs.pop('editable', False)
+        self.endpoint = kwargs.pop('endpoint', None)
         assert len(kwargs) == 0, "Unrecognized params to W2GridView: %s" % ", ".join(kwargs.keys())
         self.w2columns = {}     # W2Column's for view
+        self.fields = []        # Fields selected by the query, recid first
         self.primarycol = None  # W2Column of primary column
         self.model = None       # The primary database table model
         self.query = None       # Database query
         self.colspec = []       # w2ui grid column parameter
         self.searchspec = []    # w2ui grid search paramter
         self.recid = None       # w2ui grid rec_id field
+        self.summarycols = {}   # W2Column's with a summary aggregate
+        self.facetcols = {}     # W2Column's with value counts for the search panel
         # Copy W2Column attributes from view class into our W2GridView object instance...
         for attr in self.view.__dict__:
             obj = getattr(self.view, attr)
@@ -63,23 +112,69 @@ class W2GridView(MethodView):
                     self.model = obj.model_column.class_
                     self.recid = attr
         # build the query
-        qry_fields = []
-        for c in self.w2columns.values():
-            if c.model_column is not None:
-                qry_fields.append(c.model_column)
-        self.query = session.query(*qry_fields)
+        self.fields = list(self.w2columns.keys())
+        self.query = self.plan_query()
         # Buile w2ui grid column and search parameters...
         for field, w2col in self.w2columns.items():
             self.colspec.append(w2col.column_spec(field))
             if w2col.has_search_specs:
                self.searchspec.append(w2col.search_spec(field))
+            if w2col.aggregate is not None:
+                self.summarycols[field] = w2col
+            if w2col.facet:
+                self.facetcols[field] = w2col
 
-    def get(self):
+    def plan_query(self, fields=None, joined=()):
+        """Returns the query selecting the view's columns, or only those in fields.  Related columns are reached
+        by explicit outer joins along their (many to one) paths and path aggregates by correlated subqueries, so
+        a page of rows is always fetched by one statement rather than lazy loading each row's relations.  The
+        paths of the related fields in joined are joined without being selected."""
+        qry_fields = []
+        joins = {}
+        for field, c in self.w2columns.items():
+            if c.model_column is None or (fields is not None and field not in fields and field not in joined):
+                continue
+            if fields is None or field in fields:
+                qry_fields.append(c.expression)
+            if c.path_aggregate is not None:
+                assert len(c.path) == 1, "A path aggregate must follow a single relationship: %s" % c.field
+                continue
+            for i, relationship in enumerate(c.path):
+                assert not relationship.property.uselist, \
+                    "A one to many path needs a path_aggregate: %s" % relationship
+                joins.setdefault(tuple(str(r) for r in c.path[:i + 1]), relationship)
+        q = session.query(*qry_fields).select_from(self.model)
+        for relationship in joins.values():
+            q = q.outerjoin(relationship)
+        return q
+
+    def project(self, columns, w2search=None):
+        """Restrict the query to the fields in columns (the grid's visible columns) and the recid.  Names that
+        are not fields of the view are ignored.  Hidden fields that are searched, summarized or counted as
+        facets stay joined."""
+        columns = set(columns)
+        fields = [field for field in self.w2columns if field == self.recid or field in columns]
+        used = set(d['field'] for d in w2search or []) | set(self.summarycols) | set(self.facetcols)
+        joined = [field for field in self.w2columns if field in used and field not in fields]
+        key = (self.view.__tablename__, tuple(fields), tuple(joined))
+        query = projection_cache.get(key)
+        if query is None:
+            query = self.plan_query(fields, joined).with_session(None)
+            projection_cache.set(key, query)
+        self.fields = fields
+        self.query = query.with_session(session())
+
+    def get(self, field=None, fmt=None):
+        if field is not None:
+            return self.lookup(field)
+        if fmt is not None:
+            return self.export(fmt)
 
         return render_template("grid.html",
                                rec_id=self.recid,
                                url=request.url,
-                               cols=self.colspec,
+                               export_url=url_for('.' + self.endpoint + '_export', fmt='csv'),
+                               cols=self.lookup_colspec(),
                                searches=self.searchspec,
                                table=self.view.__tablename__
                                )
@@ -87,12 +182,17 @@ class W2GridView(MethodView):
     def post(self):
         w2req = json.loads(request.form['request'])
         w2cmd: str = w2req.get('cmd', None)
+        g.grid_cmd = w2cmd if w2cmd in GRID_COMMANDS else 'other'      # Label of the request's metrics
         if w2cmd == 'get':
             return self.list(w2req)
         elif w2cmd == 'save':
             return self.save(w2req)
         elif w2cmd == 'delete':
             return self.delete(w2req)
+        elif w2cmd == 'facets':
+            return self.facets(w2req)
+        elif w2cmd == 'job':
+            return self.submit_job(w2req)
 
     def delete(self, w2req):
         rowids = w2req.get('selected', None)
@@ -103,6 +203,7 @@ class W2GridView(MethodView):
                     if dbrec is not None:
                         session.delete(dbrec)
             session.commit()
+            self.invalidate_cache()
             return jsonify(dict(status="success"))
         except SQLAlchemyError as e:
             session.rollback()
@@ -120,10 +221,7 @@ class W2GridView(MethodView):
                     record = model()
                 else:
                     record = session.query(model).filter(pkey == recid).first()
-                for k, v in row.items():
-                    if k != 'recid':
-                        w2c = self.w2columns[k]
-                        setattr(record, w2c.model_column.key, v)
+                self.apply_changes(record, row)
                 if recid < 0:
                     session.add(record)
                     session.flush()
@@ -133,47 +231,418 @@ class W2GridView(MethodView):
                     updated_row = self.query.filter(pkey == recid).first()
                 updates.append(dict(recid=recid, record=self.row_as_dict(updated_row)))
             session.commit()
+            self.invalidate_cache()
             return jsonify(dict(status="success", updates=updates))
         except SQLAlchemyError as e:
             session.rollback()
             return jsonify(dict(status="error", message=str(e)))
 
+    def apply_changes(self, record, row):
+        """Set the attributes of a model record from a row of w2ui changes."""
+        for k, v in row.items():
+            if k != 'recid':
+                w2c = self.w2columns[k]
+                if isinstance(v, dict):
+                    v = v.get('id')     # Selected item of a list editor
+                if not w2c.is_related:
+                    setattr(record, w2c.model_column.key, v)
+
     def list(self, w2req):
-        w2selected: List = w2req.get('selected', None)
         w2limit: int = w2req.get('limit', None)
-        w2offset: int = w2req.get('search', None)
+        w2offset: int = w2req.get('offset', None)
+        w2columns = w2req.get('columns', None)
+
+        if isinstance(w2columns, list):
+            self.project(w2columns, w2req.get('search', None))
+        q = on_replica(self.search_query(w2req))
+        total, summary = self.totals(q, w2req)
+
+        result = dict(status='success', total=total)
+        if summary is not None:
+            result['summary'] = [summary]
+        batch_size = current_app.config.get('W2GRID_FETCH_BATCH', 500)
+        if w2limit is not None and w2limit <= batch_size:
+            q = q.order_by(self.primarycol.model_column).offset(w2offset or 0).limit(w2limit)
+            result['records'] = [self.row_as_dict(datarow) for datarow in q]
+            return jsonify(result)
+
+        # Pages larger than a batch are read from a server side cursor and the records are written to the
+        # response one batch at a time.
+        rows = self.stream(q, batch_size, w2offset, w2limit)
+
+        def generate():
+            yield json_dumps(result)[:-1] + ', "records": ['
+            separator = ''
+            batch = []
+            for datarow in rows:
+                batch.append(json_dumps(self.row_as_dict(datarow)))
+                if len(batch) == batch_size:
+                    yield separator + ','.join(batch)
+                    separator = ','
+                    batch = []
+            if batch:
+                yield separator + ','.join(batch)
+            yield ']}'
+
+        return Response(stream_with_context(generate()), mimetype='application/json')
+
+    def search_query(self, w2req):
+        """Returns the view's query filtered by the w2ui search in the request."""
         w2search: List[dict] = w2req.get('search', None)
         w2searchlogic = and_ if w2req.get('searchLogic', None) == "AND" else or_
 
-        qry_fields = []
-        for c in self.w2columns.values():
-            if c.model_column is not None:
-                qry_fields.append(c.model_column)
-
         q = self.query
-        if w2search is not None:
+        if w2search:
             fltr = None
             for d in w2search:
                 column = self.w2columns[d['field']]
                 condition = column.filter(d['operator'], d['value'])
                 fltr = condition if fltr is None else w2searchlogic(fltr, condition)
             q = q.filter(fltr)
+        return q
+
+    def search_key(self, w2req):
+        """Returns a hashable key identifying the search in a w2ui request."""
+        return json.dumps([w2req.get('search', None), w2req.get('searchLogic', None)], sort_keys=True)
+
+    def totals(self, q, w2req):
+        """Returns a tuple (total, summary) for the searched query.  The row count and the summary aggregates
+        are computed by one aggregate query and cached until the view's data changes."""
+        key = (self.view.__tablename__, 'totals', self.search_key(w2req))
+        cached = grid_cache.get(key)
+        if cached is None:
+            cached = self.totals_result(self.totals_query(q).one())
+            grid_cache.set(key, cached, current_app.config.get('W2GRID_CACHE_TTL', None))
+        return cached
+
+    def totals_query(self, q):
+        """Returns the query of the row count and summary aggregates of the searched query q."""
+        aggregates = [w2col.summarize() for w2col in self.summarycols.values()]
+        return q.with_entities(func.count(self.primarycol.model_column), *aggregates)
+
+    def totals_result(self, values):
+        """Returns the tuple (total, summary) for a row of totals_query."""
+        summary = None
+        if self.summarycols:
+            summary = dict(recid='S-1', w2ui=dict(summary=True))
+            for (field, w2col), value in zip(self.summarycols.items(), values[1:]):
+                summary[field] = w2col.handler.summary_to_json(w2col.aggregate, value)
+        return values[0], summary
+
+    def facets(self, w2req):
+        """Returns the row counts for each value of the view's facet columns over the current search.  All
+        facets are counted by a single statement and cached until the view's data changes."""
+        key = (self.view.__tablename__, 'facets', self.search_key(w2req))
+        facets = grid_cache.get(key)
+        if facets is None:
+            counts = []
+            if self.facetcols:
+                counts = self.facet_counts(on_replica(self.search_query(w2req)))
+            facets = self.facets_result(counts)
+            grid_cache.set(key, facets, current_app.config.get('W2GRID_CACHE_TTL', None))
+        return jsonify(dict(status='success', facets=facets))
+
+    def facets_result(self, counts):
+        """Returns {field: [{value, count}, ...]} from tuples (facet index, value, count), most frequent first."""
+        facets = {field: [] for field in self.facetcols}
+        fields = list(self.facetcols.keys())
+        for index, value, count in counts:
+            w2col = self.facetcols[fields[index]]
+            facets[fields[index]].append(dict(value=w2col.handler.to_json(value), count=count))
+        for values in facets.values():
+            values.sort(key=lambda d: d['count'], reverse=True)
+        return facets
+
+    def facet_counts(self, q):
+        """Yields tuples (facet index, value, count) for the facet columns over query q."""
+        statement, decode = self.facet_statement(q, session.get_bind().dialect.name)
+        for row in session.execute(statement):
+            yield decode(row)
 
-        rows = []
-        for datarow in q.all():
-            rows.append(self.row_as_dict(datarow))
+    def facet_statement(self, q, dialect_name):
+        """Returns the statement counting the facet columns' values over query q on a database of dialect
+        dialect_name, and the function decoding its rows into tuples (facet index, value, count).  Values are
+        those of the columns' expressions, q must join the paths of related facet columns as the view's query
+        does."""
+        columns = [w2col.expression for w2col in self.facetcols.values()]
+        count = func.count(self.primarycol.model_column)
+        if dialect_name in GROUPING_SETS_DIALECTS:
+            # One GROUP BY GROUPING SETS ((c1), (c2), ...), GROUPING(c) is 0 for the column a row is grouped by.
+            groupings = [func.grouping(c) for c in columns]
+            q = q.with_entities(*columns, *groupings, count).group_by(func.grouping_sets(*columns))
+            n = len(columns)
 
-        return jsonify(dict(status='success', total=len(rows), records=rows))
+            def decode(row):
+                index = list(row[n:2 * n]).index(0)
+                return index, row[index], row[-1]
+            return q.statement, decode
+        else:
+            # One UNION ALL of GROUP BY per column, each column keeps its own position so its type is preserved.
+            selects = []
+            for i, c in enumerate(columns):
+                entities = [literal(i).label('facet')]
+                entities += [(c if j == i else null()).label('f%d' % j) for j in range(len(columns))]
+                selects.append(q.with_entities(*entities, count.label('count')).group_by(c).statement)
+            statement = union_all(*selects).execution_options(**q.get_execution_options())
+            return statement, lambda row: (row[0], row[row[0] + 1], row[-1])
+
+    def lookup_colspec(self):
+        """Returns the w2ui column parameters with the remote url of the lookup columns' editors."""
+        colspec = []
+        for spec in self.colspec:
+            w2col = self.w2columns[spec['field']]
+            if w2col.lookup is not None and isinstance(spec.get('editable'), dict):
+                spec = dict(spec)
+                spec['editable'] = dict(spec['editable'],
+                                        url=url_for('.' + self.endpoint + '_lookup', field=spec['field']),
+                                        cacheMax=current_app.config.get('W2GRID_LOOKUP_LIMIT', 100))
+            colspec.append(spec)
+        return colspec
+
+    def lookup(self, field):
+        """Serve a w2ui remote combo/list request: the lookup values starting with the 'search' parameter, up
+        to the configured limit.  Recent searches are kept in an LRU cache."""
+        key, q = self.lookup_query(field)
+        records = lookup_cache.get(key)
+        if records is None:
+            records = [dict(id=key_value, text=text) for key_value, text in q]
+            lookup_cache.set(key, records, current_app.config.get('W2GRID_CACHE_TTL', None))
+        return jsonify(dict(status='success', records=records))
+
+    def lookup_query(self, field):
+        """Returns the lookup_cache key and the query of (key, text) pairs of the lookup request for field.  The
+        'search' and 'max' parameters are read from the JSON 'request' parameter w2ui sends (HTTPJSON), or from
+        the query string itself."""
+        w2col = self.w2columns.get(field, None)
+        if w2col is None or w2col.lookup is None:
+            abort(404)
+        params = request.args
+        if 'request' in request.args:
+            try:
+                params = json.loads(request.args['request'])
+            except ValueError:
+                abort(400)
+            if not isinstance(params, dict):
+                abort(400)
+        search = str(params.get('search') or '')
+        limit = current_app.config.get('W2GRID_LOOKUP_LIMIT', 100)
+        try:
+            limit = max(1, min(int(params.get('max', limit)), limit))
+        except (TypeError, ValueError):
+            pass
+        column = w2col.model_column if w2col.lookup is True else w2col.lookup
+
+        key = (column.class_.__table__.name, field, str(column), search, limit)
+        if w2col.lookup is True:
+            q = session.query(column, column).distinct()
+        else:
+            q = session.query(inspect(column.class_).primary_key[0], column)
+        return key, on_replica(q.filter(column.startswith(search, autoescape=True)).order_by(column).limit(limit))
+
+    def export(self, fmt):
+        """Export the rows matching the search in the 'request' parameter (a w2ui request) in format 'fmt'."""
+        if fmt not in EXPORT_FORMATS:
+            abort(404)
+        exporter = getattr(self, EXPORT_FORMATS[fmt])
+        w2req = json.loads(request.args.get('request', '{}'))
+        return exporter(on_replica(self.search_query(w2req)))
+
+    def export_csv(self, q):
+        """Stream the rows of query q as CSV.  Rows are fetched from a server side cursor in batches and each
+        batch is sent as soon as it is written, so memory use does not grow with the number of rows."""
+        batch_size = current_app.config.get('W2GRID_EXPORT_BATCH', 1000)
+        fields = list(self.w2columns.keys())
+
+        def generate():
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(fields)
+            for n, datarow in enumerate(self.stream(q, batch_size), 1):
+                writer.writerow(list(self.row_as_dict(datarow).values()))
+                if n % batch_size == 0:
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate()
+            yield buffer.getvalue()
+
+        filename = "%s.csv" % self.view.__tablename__
+        return Response(stream_with_context(generate()), mimetype='text/csv',
+                        headers={'Content-Disposition': 'attachment; filename="%s"' % filename})
+
+    def export_arrow(self, q):
+        """Stream the rows of query q as an Apache Arrow IPC stream, one record batch per database batch."""
+        return self.export_columnar(q, columnar.arrow_stream, 'application/vnd.apache.arrow.stream', 'arrows')
+
+    def export_parquet(self, q):
+        """Send the rows of query q as a Parquet file, written to a temporary file and served memory mapped."""
+        return self.export_columnar(q, columnar.parquet_file, 'application/vnd.apache.parquet', 'parquet')
+
+    def export_columnar(self, q, writer, mimetype, extension):
+        # Columnar exports keep the database values, typed from each column's SQLAlchemy type.
+        if not columnar.available():
+            abort(501, "Columnar export requires the pyarrow package")
+        batch_size = current_app.config.get('W2GRID_EXPORT_BATCH', 1000)
+        schema = columnar.arrow_schema(self.w2columns)
+        content = writer(self.stream(q, batch_size), schema, batch_size)
+        filename = "%s.%s" % (self.view.__tablename__, extension)
+        return Response(stream_with_context(content), mimetype=mimetype,
+                        headers={'Content-Disposition': 'attachment; filename="%s"' % filename})
+
+    def stream(self, q, batch_size, offset=None, limit=None):
+        """Returns an iterator over the rows of query q in primary key order, optionally from offset and up to
+        limit rows, read from a server side cursor batch_size rows at a time."""
+        q = q.order_by(self.primarycol.model_column)
+        if offset or limit is not None:
+            q = q.offset(offset or 0).limit(limit)
+        return q.execution_options(stream_results=True).yield_per(batch_size)
+
+    def bulk_load(self, records, batch_size=5000, upsert=False):
+        """Insert (or with upsert, insert or update by primary key) an iterable of records, dictionaries of
+        field values already converted with the handlers' from_json.  Fields left out of a record take their
+        column's default when inserted and are unchanged when updated.  Records repeating a primary key within
+        a batch are loaded once, the last one wins.  Each batch is written with one executemany statement per
+        kind of change and set of fields, and committed.  Yields the number of rows in each committed batch."""
+        table = self.model.__table__
+        pkey = self.primarycol.model_column
+        batch = {}      # (primary key,) or (None, position) -> row
+        for n, record in enumerate(records):
+            row = {self.w2columns[field].model_column.key: value for field, value in record.items()}
+            key = (row[pkey.key],) if row.get(pkey.key) is not None else (None, n)
+            batch.pop(key, None)
+            batch[key] = row
+            if len(batch) >= batch_size:
+                yield self._load_batch(table, pkey, list(batch.values()), upsert)
+                batch = {}
+        if batch:
+            yield self._load_batch(table, pkey, list(batch.values()), upsert)
+        self.invalidate_cache()
+
+    def _load_batch(self, table, pkey, batch, upsert):
+        inserts, updates = batch, []
+        if upsert:
+            keys = [row[pkey.key] for row in batch if row.get(pkey.key) is not None]
+            existing = {row[0] for row in session.query(pkey).filter(pkey.in_(keys))} if keys else set()
+            inserts = [row for row in batch if row.get(pkey.key) not in existing]
+            updates = [dict(row, _pkey=row[pkey.key]) for row in batch if row.get(pkey.key) in existing]
+        # The rows of an executemany must all have the same keys
+        for rows in _group_by_keys(inserts):
+            session.execute(table.insert(), rows)
+        for rows in _group_by_keys(updates):
+            session.execute(table.update().where(pkey == bindparam('_pkey')), rows)
+        session.commit()
+        return len(batch)
+
+    def submit_job(self, w2req):
+        """Queue a background job ('xlsx' export or 'delete') over the rows matching the request's search.  A
+        delete without a search would empty the table, it is only queued if the request has 'confirm' set and
+        its 'total' is the current number of rows."""
+        name = w2req.get('job', None)
+        if name not in ('xlsx', 'delete'):
+            return jsonify(dict(status="error", message="Unknown job: %s" % name))
+        search = dict(search=w2req.get('search', None), searchLogic=w2req.get('searchLogic', None))
+        if name == 'delete' and not search['search']:
+            total = self.totals_query(self.search_query(search)).one()[0]
+            if not w2req.get('confirm', False) or w2req.get('total', None) != total:
+                return jsonify(dict(status="error", total=total,
+                                    message="Deleting all %d rows needs confirm and their total" % total))
+        job = job_queue.submit(name, endpoint=self.endpoint, w2req=search)
+        return jsonify(dict(status="success", job=job.load(), url=url_for('.job_status', id=job.id)))
+
+    def invalidate_cache(self):
+        """Discard cached search results and lookups for this view after its data has changed."""
+        tablename = self.view.__tablename__
+        grid_cache.discard(lambda key: key[0] == tablename)
+        table = self.model.__table__.name
+        lookup_cache.discard(lambda key: key[0] == table)
+        if issubclass(self.model, UserBase):
+            user_cache.clear()     # Bulk loads bypass the ORM flush that discards changed users
 
     def row_as_dict(self, query_row):
         # Convert a row in a query result to a dictionary
         row = {}
         j = 0
-        for fieldname, w2col in self.w2columns.items():
-            row[fieldname] = w2col.handler.to_json(query_row[j])
+        for fieldname in self.fields:
+            row[fieldname] = self.w2columns[fieldname].handler.to_json(query_row[j])
             j += 1
         return row
 
-blueprint.add_url_rule('/users',
-                       view_func=W2GridView.as_view('edit', view=UserView, editable=True),
-                       methods=['GET','POST'])
+
+def _group_by_keys(rows):
+    """Returns lists of the rows having the same set of keys."""
+    groups = {}
+    for row in rows:
+        groups.setdefault(tuple(sorted(row)), []).append(row)
+    return groups.values()
+
+
+def add_grid_rules(bp: Blueprint, rule: str, endpoint: str, view, **kwargs):
+    """Register a W2GridView of view class 'view' at url 'rule', along with its per column lookup url and its
+    export url."""
+    grid_views[endpoint] = (view, kwargs)
+    view_func = W2GridView.as_view(endpoint, view=view, endpoint=endpoint, **kwargs)
+    bp.add_url_rule(rule, view_func=view_func, methods=['GET', 'POST'])
+    bp.add_url_rule(rule + '/lookup/<field>', endpoint=endpoint + '_lookup', view_func=view_func, methods=['GET'])
+    bp.add_url_rule(rule + '/export.<fmt>', endpoint=endpoint + '_export', view_func=view_func, methods=['GET'])
+
+
+add_grid_rules(blueprint, '/users', 'edit', UserView, editable=True)
+add_grid_rules(blueprint, '/items', 'items', ItemsView, editable=True)
+
+
+def grid_view(endpoint) -> W2GridView:
+    """Returns a W2GridView for a registered endpoint, or for the endpoint whose view has __tablename__
+    'endpoint', for use outside of a request (jobs, CLI)."""
+    if endpoint not in grid_views:
+        for name, (view, kwargs) in grid_views.items():
+            if view.__tablename__.lower() == endpoint.lower():
+                endpoint = name
+                break
+    view, kwargs = grid_views[endpoint]
+    return W2GridView(view=view, endpoint=endpoint, **kwargs)
+
+
+@job_queue.task('xlsx')
+def export_xlsx_job(job, endpoint, w2req):
+    """Export the rows matching a search to an XLSX workbook.  Rows are streamed to a CSV file in the job's
+    thread and the workbook is built from it in a worker process."""
+    grid = grid_view(endpoint)
+    batch_size = current_app.config.get('W2GRID_EXPORT_BATCH', 1000)
+    q = on_replica(grid.search_query(w2req))
+    total = grid.totals(q, w2req)[0]
+    csv_path = job.path('.csv')
+    with open(csv_path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow([w2col.caption or field for field, w2col in grid.w2columns.items()])
+        for n, datarow in enumerate(grid.stream(q, batch_size)):
+            writer.writerow(list(grid.row_as_dict(datarow).values()))
+            if n % batch_size == 0:
+                job.progress(n, total, "Reading rows")
+    try:
+        job_queue.process_pool.submit(build_xlsx, job, csv_path, job.path('.xlsx'), total).result()
+    finally:
+        os.remove(csv_path)
+    return job.path('.xlsx'), "%s.xlsx" % grid.view.__tablename__
+
+
+@job_queue.task('delete')
+def delete_job(job, endpoint, w2req):
+    """Delete the rows matching a search, one committed batch at a time.  Rows are deleted through the ORM so
+    that flush hooks (maintained aggregates) see them."""
+    grid = grid_view(endpoint)
+    batch_size = current_app.config.get('W2GRID_EXPORT_BATCH', 1000)
+    pkey = grid.primarycol.model_column
+    q = grid.search_query(w2req)
+    total = grid.totals(q, w2req)[0]
+    done = 0
+    try:
+        while True:
+            ids = [row[0] for row in q.with_entities(pkey).order_by(pkey).limit(batch_size)]
+            if not ids:
+                break
+            for dbrec in session.query(grid.model).filter(pkey.in_(ids)):
+                session.delete(dbrec)
+            session.commit()
+            done += len(ids)
+            job.progress(done, total, "Deleting rows")
+    finally:
+        grid.invalidate_cache()
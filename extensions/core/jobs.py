@@ -0,0 +1,230 @@
+"""
+Identification
+    Module:     jobs.py
+    Author:     Victor Puska
+    Written:    Oct 19, 2026
+    Copyright:  (c) 2026 by VICTOR PUSKA.
+    License:    LICENSE_NAME, see LICENSE_FILE for more details.
+
+Description
+    Local background job queue for long running work (exports, large deletes, imports).  Jobs run on a
+    thread pool inside an application context; CPU bound steps can be handed to a process pool.  Job state
+    is kept in files under JOB_DIR so that any web worker or the CLI can report on or cancel a job.
+"""
+
+import csv
+import datetime
+import json
+import multiprocessing
+import os
+import re
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Dict, Callable
+
+from flask import Flask
+
+
+# Statuses of jobs that have stopped running
+FINISHED = ('done', 'failed', 'cancelled')
+
+
+class JobCancelled(Exception):
+    """Raised inside a job's task when the job has been cancelled."""
+    pass
+
+
+class Job(object):
+    """Handle on the file backed state of a job.  A Job only holds paths, so it can be passed to a worker
+    process and used there to report progress and check for cancellation."""
+
+    PROGRESS_INTERVAL = 0.5     # Minimum seconds between progress writes
+
+    def __init__(self, directory, id):
+        self.directory = directory
+        self.id = id
+        self._last_progress = 0.0
+
+    def path(self, suffix):
+        """Returns the path of a file belonging to the job, e.g. job.path('.csv')"""
+        return os.path.join(self.directory, self.id + suffix)
+
+    def load(self) -> Dict:
+        with open(self.path('.json')) as f:
+            return json.load(f)
+
+    def update(self, **kwargs):
+        """Update the job's state, the state file is replaced atomically."""
+        state = self.load() if os.path.exists(self.path('.json')) else {}
+        state.update(kwargs)
+        tmp = self.path('.json.tmp%d' % os.getpid())
+        with open(tmp, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp, self.path('.json'))
+
+    def progress(self, done, total=None, message=None):
+        """Report progress.  Raises JobCancelled if the job has been cancelled, so tasks stop at the next
+        progress report."""
+        if self.cancelled:
+            raise JobCancelled()
+        now = time.monotonic()
+        if now - self._last_progress >= self.PROGRESS_INTERVAL:
+            self._last_progress = now
+            state = dict(done=done, total=total)
+            if message is not None:
+                state['message'] = message
+            self.update(**state)
+
+    @property
+    def cancelled(self):
+        return os.path.exists(self.path('.cancel'))
+
+    def cancel(self):
+        open(self.path('.cancel'), 'w').close()
+        if self.load()['status'] == 'queued':
+            self.update(status='cancelled', finished=_now())
+
+
+class JobQueue(object):
+    """The job queue of the application.  Tasks are registered by name with the `task` decorator and
+    submitted with `submit`.  A task is called as task(job, **params) and returns None or a tuple
+    (result path, download filename)."""
+
+    def __init__(self):
+        self.app: Flask = None
+        self.tasks: Dict[str, Callable] = {}
+        self._threads = None
+        self._processes = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app: Flask):
+        app.config.setdefault('JOB_DIR', os.path.join(app.instance_path, 'jobs'))
+        app.config.setdefault('JOB_THREADS', 4)
+        app.config.setdefault('JOB_PROCESSES', 2)
+        app.config.setdefault('JOB_EXPIRY_HOURS', 24)
+        self.app = app
+
+    def task(self, name):
+        """Decorator registering a task function under name."""
+        def decorator(f):
+            self.tasks[name] = f
+            return f
+        return decorator
+
+    @property
+    def directory(self):
+        directory = self.app.config['JOB_DIR']
+        os.makedirs(directory, exist_ok=True)
+        return directory
+
+    @property
+    def thread_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._threads is None:
+                self._threads = ThreadPoolExecutor(self.app.config['JOB_THREADS'], thread_name_prefix='job')
+            return self._threads
+
+    @property
+    def process_pool(self) -> ProcessPoolExecutor:
+        """Pool for CPU bound steps.  Workers are spawned rather than forked from the threaded web process."""
+        with self._lock:
+            if self._processes is None:
+                self._processes = ProcessPoolExecutor(self.app.config['JOB_PROCESSES'],
+                                                      mp_context=multiprocessing.get_context('spawn'))
+            return self._processes
+
+    def create(self, name, **params) -> Job:
+        assert name in self.tasks, "Unknown job task: %s" % name
+        job = Job(self.directory, uuid.uuid4().hex)
+        job.update(id=job.id, name=name, params=params, status='queued', created=_now(),
+                   done=0, total=None, message=None)
+        return job
+
+    def submit(self, name, **params) -> Job:
+        """Queue task 'name' to run on the thread pool, returns the new job.  Expired jobs are removed first."""
+        self.expire()
+        job = self.create(name, **params)
+        self.thread_pool.submit(self.run, job)
+        return job
+
+    def run(self, job: Job):
+        """Run a job in the current thread, inside an application context."""
+        state = job.load()
+        if job.cancelled:
+            return
+        job.update(status='running', started=_now())
+        with self.app.app_context():
+            try:
+                result = self.tasks[state['name']](job, **state['params'])
+                if result is not None:
+                    job.update(result=result[0], filename=result[1])
+                job.update(status='done', finished=_now(), done=job.load().get('total'))
+            except JobCancelled:
+                job.update(status='cancelled', finished=_now())
+            except Exception as e:
+                self.app.logger.error(traceback.format_exc())
+                job.update(status='failed', finished=_now(), message=str(e))
+
+    def expire(self, hours=None):
+        """Remove the files of the jobs that finished more than hours (JOB_EXPIRY_HOURS) ago.  Returns the
+        number of jobs removed."""
+        hours = self.app.config['JOB_EXPIRY_HOURS'] if hours is None else hours
+        if hours is None:
+            return 0
+        cutoff = (datetime.datetime.now() - datetime.timedelta(hours=hours)).isoformat(timespec='seconds')
+        names = os.listdir(self.directory)
+        expired = set()
+        for name in names:
+            if not name.endswith('.json'):
+                continue
+            try:
+                state = Job(self.directory, name[:-5]).load()
+            except (OSError, ValueError):
+                continue    # Removed or being replaced by another worker
+            if state.get('status') in FINISHED and state.get('finished', cutoff) < cutoff:
+                expired.add(state['id'])
+        for name in names:
+            if name[:32] in expired:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    pass
+        return len(expired)
+
+    def job(self, id) -> Job:
+        """Returns the job with id or None."""
+        if not re.fullmatch('[0-9a-f]{32}', id or '') or not os.path.exists(os.path.join(self.directory, id + '.json')):
+            return None
+        return Job(self.directory, id)
+
+    def jobs(self):
+        """Returns the states of all jobs, oldest first."""
+        states = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.json'):
+                states.append(Job(self.directory, name[:-5]).load())
+        return sorted(states, key=lambda s: s['created'])
+
+
+def _now():
+    return datetime.datetime.now().isoformat(timespec='seconds')
+
+
+def build_xlsx(job: Job, csv_path, xlsx_path, total=None):
+    """Convert a CSV file into an XLSX workbook.  Runs in a worker process of the job queue's process pool,
+    requires the optional openpyxl package."""
+    import openpyxl
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    with open(csv_path, newline='') as f:
+        for n, row in enumerate(csv.reader(f)):
+            sheet.append(row)
+            if n % 1000 == 0:
+                job.progress(n, total, "Building workbook")
+    workbook.save(xlsx_path)
+
+
+job_queue = JobQueue()
@@ -0,0 +1,95 @@
+"""
+Identification
+    Module:     lastaccess.py
+    Author:     Victor Puska
+    Written:    Oct 19, 2026
+    Copyright:  (c) 2026 by VICTOR PUSKA.
+    License:    LICENSE_NAME, see LICENSE_FILE for more details.
+
+Description
+    Write-behind maintenance of User.lastaccess.  Requests record the time a user was last seen in memory and
+    a background thread writes the latest time of each user with one executemany UPDATE per interval.
+"""
+
+import atexit
+import datetime
+import threading
+
+from flask import Flask
+from flask_login import current_user
+from sqlalchemy import update, bindparam, or_
+
+from . database import db, User
+
+
+class AccessTracker(object):
+    """Records the last request time of authenticated users and writes them every LASTACCESS_INTERVAL
+    seconds, and when the process exits.  LASTACCESS_INTERVAL 0 disables tracking."""
+
+    def __init__(self):
+        self.app: Flask = None
+        self.interval = 0
+        self._pending = {}          # user id -> last request time
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+
+    def init_app(self, app: Flask):
+        app.config.setdefault('LASTACCESS_INTERVAL', 5)
+        self.interval = app.config['LASTACCESS_INTERVAL']
+        if not self.interval:
+            return
+        self.app = app
+        app.after_request(self.after_request)
+        atexit.register(self.stop)
+
+    def after_request(self, response):
+        if current_user.is_authenticated:
+            self.touch(current_user.id)
+        return response
+
+    def touch(self, user_id, when=None):
+        with self._lock:
+            self._pending[user_id] = when or datetime.datetime.now()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='lastaccess', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.flush()
+            except Exception:
+                self.app.logger.exception("Writing last access times failed")
+
+    def flush(self):
+        """Write the pending last access times, returns the number of users updated."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+        table = User.__table__
+        # Other workers may have written a later time for the user, it is kept
+        stmt = update(table) \
+            .where(table.c.id == bindparam('_id'),
+                   or_(table.c.lastaccess.is_(None), table.c.lastaccess < bindparam('_lastaccess'))) \
+            .values(lastaccess=bindparam('_lastaccess'))
+        try:
+            with self.app.app_context(), db.engine.begin() as connection:
+                connection.execute(stmt, [dict(_id=k, _lastaccess=v) for k, v in pending.items()])
+        except Exception:
+            # Keep the times for the next flush, unless newer ones have been recorded since
+            with self._lock:
+                for k, v in pending.items():
+                    self._pending.setdefault(k, v)
+            raise
+        return len(pending)
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+
+
+access_tracker = AccessTracker()
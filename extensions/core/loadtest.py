@@ -0,0 +1,258 @@
+"""
+Identification
+    Module:     loadtest.py
+    Author:     Victor Puska
+    Written:    Oct 19, 2026
+    Copyright:  (c) 2026 by VICTOR PUSKA.
+    License:    LICENSE_NAME, see LICENSE_FILE for more details.
+
+Description
+    In-process load driver for the grid endpoints.  Worker threads or forked processes call the application
+    through the Flask test client with a weighted mix of w2ui requests and report throughput, latency
+    percentiles and database statements per request.
+"""
+
+import json
+import multiprocessing
+import random
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from flask import Flask
+from sqlalchemy import event
+from sqlalchemy.sql.sqltypes import String, Integer, Boolean
+from werkzeug.exceptions import HTTPException
+
+from . database import db, session
+
+
+DEFAULT_MIX = "page=5,list=75,save=15,delete=5"
+
+# Operators of the searches made by list requests, with the part of a sampled value searched for
+SEARCH_VALUES = {'contains': lambda v: v[1:3], 'begins': lambda v: v[:2], 'ends': lambda v: v[-2:], 'is': lambda v: v}
+
+
+def parse_mix(text) -> Dict[str, int]:
+    """Parse a request mix such as 'page=5,list=75,save=15,delete=5' into {operation: weight}."""
+    mix = {}
+    for part in text.split(","):
+        op, weight = part.split("=")
+        assert op in LoadDriver.OPERATIONS, "Unknown operation: %s" % op
+        mix[op] = int(weight)
+    return mix
+
+
+def grid_at(app: Flask, url):
+    """Returns the W2GridView served at url.  Raises ValueError if url is not a grid view's url."""
+    from . grid import grid_views, grid_view
+    try:
+        endpoint = app.url_map.bind('localhost').match(url, method='POST')[0].rsplit('.', 1)[-1]
+    except HTTPException:
+        endpoint = None
+    if endpoint not in grid_views:
+        raise ValueError("No grid view at %s" % url)
+    return grid_view(endpoint)
+
+
+def percentile(values: List[float], p) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100.0 * (len(values) - 1))))]
+
+
+class LoadDriver(object):
+    """Drive the grid at url with a mix of requests:
+
+        page    GET the grid page
+        list    POST cmd=get, a random page of a random search
+        save    POST cmd=save, change a text field of an existing row
+        delete  POST cmd=save to insert a row, then POST cmd=delete to remove it again
+
+    The rows, fields and searches are those of the grid's view: saves write its editable text fields, inserts
+    fill its required fields and searches use its search operators with values sampled from its rows.
+    """
+
+    OPERATIONS = ('page', 'list', 'save', 'delete')
+
+    def __init__(self, app: Flask, mix: Dict[str, int], url='/users', page_size=100, seed=0):
+        self.app = app
+        self.mix = mix
+        self.url = url
+        self.page_size = page_size
+        self.seed = seed
+        self._statements = 0
+        self._lock = threading.Lock()
+        with app.app_context():
+            self.grid = grid_at(app, url)
+            pkey = self.grid.primarycol.model_column
+            self.ids = [row[0] for row in session.query(pkey).order_by(pkey).limit(1000)]
+            self.searches = self.sample_searches(random.Random(seed))
+        # Fields written by saves and fields that need a value to insert a row
+        self.text_fields = []
+        self.required_fields = []
+        for field, w2col in self.grid.w2columns.items():
+            if not w2col.editable or w2col.is_related or w2col is self.grid.primarycol:
+                continue
+            column = w2col.model_column.property.columns[0]
+            editor = w2col.editable.get('type', None) if isinstance(w2col.editable, dict) else 'text'
+            if isinstance(column.type, String) and editor == 'text' and not column.unique:
+                self.text_fields.append(field)
+            if not column.nullable and column.default is None and column.server_default is None:
+                if column.foreign_keys or not isinstance(column.type, (String, Integer, Boolean)):
+                    raise ValueError("No test value for the required field %s of %s" % (field, url))
+                self.required_fields.append(field)
+        if mix.get('save') and not self.text_fields:
+            raise ValueError("The grid at %s has no editable text field to save" % url)
+
+    def sample_searches(self, rnd) -> List:
+        """Returns the searches of list requests: no search, and a search of each of the view's search fields
+        with a value from a sample of rows."""
+        rows = [self.grid.row_as_dict(row) for row in self.grid.query.limit(100)]
+        searches = [None]
+        for spec in self.grid.searchspec:
+            part = SEARCH_VALUES.get(spec.get('operator', None), None)
+            values = [row[spec['field']] for row in rows if row.get(spec['field']) not in (None, '')]
+            if part is not None and values:
+                value = rnd.choice(values)
+                value = part(value) if isinstance(value, str) else value
+                searches.append([dict(field=spec['field'], operator=spec['operator'], value=value)])
+        return searches
+
+    def new_row(self, rnd) -> Dict:
+        """Returns the changes of a row to insert, with values for its required fields."""
+        row = dict(recid=-1)
+        for field in self.required_fields:
+            column = self.grid.w2columns[field].model_column.property.columns[0]
+            if isinstance(column.type, String):
+                row[field] = ('load%d' % rnd.getrandbits(48))[:column.type.length]
+            elif isinstance(column.type, Boolean):
+                row[field] = False
+            else:
+                row[field] = 0
+        return row
+
+    def _count_statement(self, *args):
+        with self._lock:
+            self._statements += 1
+
+    def _post(self, client, w2req):
+        w2req.setdefault('selected', [])
+        w2req.setdefault('limit', self.page_size)
+        w2req.setdefault('offset', 0)
+        response = client.post(self.url, data={'request': json.dumps(w2req)})
+        if response.status_code != 200 or response.get_json().get('status') != 'success':
+            raise RuntimeError(response.data[:200])
+        return response.get_json()
+
+    def op_page(self, client, rnd, timed):
+        with timed('page'):
+            response = client.get(self.url)
+            if response.status_code != 200:
+                raise RuntimeError(response.status)
+
+    def op_list(self, client, rnd, timed):
+        w2req = dict(cmd='get', offset=self.page_size * rnd.randint(0, 10))
+        search = rnd.choice(self.searches)
+        if search is not None:
+            w2req.update(search=search, searchLogic='AND')
+        with timed('list'):
+            self._post(client, w2req)
+
+    def op_save(self, client, rnd, timed):
+        change = {'recid': rnd.choice(self.ids), rnd.choice(self.text_fields): 'Load %d' % rnd.randint(0, 99999)}
+        with timed('save'):
+            self._post(client, dict(cmd='save', changes=[change]))
+
+    def op_delete(self, client, rnd, timed):
+        with timed('save'):
+            updates = self._post(client, dict(cmd='save', changes=[self.new_row(rnd)]))
+        with timed('delete'):
+            self._post(client, dict(cmd='delete', selected=[updates['updates'][0]['record'][self.grid.recid]]))
+
+    def worker(self, index, duration) -> Dict:
+        """Run requests for duration seconds, returns {'latencies': {op: [ms]}, 'errors': n, 'statements': n}.
+        The statement count is the process's, it includes other worker threads of the process."""
+        start_statements = self._statements
+        rnd = random.Random(self.seed + index)
+        ops = list(self.mix.keys())
+        weights = list(self.mix.values())
+        latencies = defaultdict(list)
+        errors = 0
+        client = self.app.test_client()
+
+        class timed(object):
+            def __init__(self, op):
+                self.op = op
+
+            def __enter__(self):
+                self.start = time.perf_counter()
+
+            def __exit__(self, *exc):
+                latencies[self.op].append((time.perf_counter() - self.start) * 1000.0)
+
+        deadline = time.monotonic() + duration
+        while time.monotonic() < deadline:
+            op = rnd.choices(ops, weights)[0]
+            try:
+                getattr(self, 'op_' + op)(client, rnd, timed)
+            except Exception:
+                errors += 1
+        return dict(latencies=dict(latencies), errors=errors, statements=self._statements - start_statements)
+
+    def run(self, concurrency=4, duration=10.0, mode='thread') -> Dict:
+        """Run concurrency workers as threads or forked processes and combine their results.  Statements are
+        counted by an engine listener that is removed when the run ends."""
+        with self.app.app_context():
+            engine = db.engine
+        event.listen(engine, "before_cursor_execute", self._count_statement)
+        try:
+            start_statements = self._statements
+            start = time.perf_counter()
+            if mode == 'process':
+                global _driver
+                _driver = self
+                with multiprocessing.get_context('fork').Pool(concurrency) as pool:
+                    results = pool.starmap(_process_worker, [(i, duration) for i in range(concurrency)])
+                statements = sum(r['statements'] for r in results)
+            else:
+                with ThreadPoolExecutor(concurrency) as pool:
+                    results = list(pool.map(self.worker, range(concurrency), [duration] * concurrency))
+                statements = self._statements - start_statements
+            elapsed = time.perf_counter() - start
+        finally:
+            event.remove(engine, "before_cursor_execute", self._count_statement)
+        return self.summarize(results, elapsed, statements)
+
+    def summarize(self, results, elapsed, statements) -> Dict:
+        latencies = defaultdict(list)
+        for r in results:
+            for op, values in r['latencies'].items():
+                latencies[op].extend(values)
+        latencies['all'] = [v for op in list(latencies) for v in latencies[op]]
+        requests = len(latencies['all'])
+        summary = dict(elapsed=elapsed, requests=requests, rps=requests / elapsed if elapsed else 0.0,
+                       errors=sum(r['errors'] for r in results),
+                       statements_per_request=statements / requests if requests else 0.0, operations={})
+        for op, values in latencies.items():
+            summary['operations'][op] = dict(count=len(values), p50=percentile(values, 50),
+                                             p95=percentile(values, 95), p99=percentile(values, 99))
+        return summary
+
+
+def drive(app: Flask, mix: Dict[str, int], url, page_size, seed, concurrency, duration, mode) -> Dict:
+    """Run a LoadDriver of the grid at url on app and return its results."""
+    return LoadDriver(app, mix, url, page_size, seed).run(concurrency, duration, mode)
+
+
+_driver: LoadDriver = None
+
+
+def _process_worker(index, duration):
+    # Forked worker: drop the connections inherited from the parent and count this process's statements.
+    with _driver.app.app_context():
+        db.engine.dispose(close=False)
+    return _driver.worker(index, duration)
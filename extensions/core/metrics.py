@@ -0,0 +1,277 @@
+"""
+Identification
+    Module:     metrics.py
+    Author:     Victor Puska
+    Written:    Oct 19, 2026
+    Copyright:  (c) 2026 by VICTOR PUSKA.
+    License:    LICENSE_NAME, see LICENSE_FILE for more details.
+
+Description
+    Request metrics in Prometheus text format: latency histograms per endpoint and grid command, requests in
+    flight, response sizes and error counts.  Each thread counts into its own shard, shards are only summed
+    when the metrics are read.  Workers sharing METRICS_DIR publish their counts there and each worker's
+    metrics route reports the total of all of them.
+"""
+
+import atexit
+import glob
+import json
+import os
+import threading
+import time
+import weakref
+from collections import defaultdict
+from typing import Dict
+
+from flask import Flask, Response, request, g
+
+
+# Upper bounds, in seconds, of the latency histogram buckets
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _Shard(object):
+    """The counts of one thread.  Only its thread writes to it."""
+    __slots__ = ('latency', 'sizes', 'errors', 'inflight')
+
+    def __init__(self):
+        self.latency = {}                   # (endpoint, cmd) -> [bucket counts..., +Inf count, sum]
+        self.sizes = {}                     # (endpoint, cmd) -> [count, sum]
+        self.errors = defaultdict(int)      # (endpoint, cmd, status) -> count
+        self.inflight = defaultdict(int)    # endpoint -> requests in progress
+
+    def counts(self) -> Dict:
+        return dict(latency=dict(self.latency), sizes=dict(self.sizes), errors=dict(self.errors),
+                    inflight=dict(self.inflight))
+
+
+class _Owner(object):
+    """Held by a thread's local storage only, so it is released when the thread ends."""
+    __slots__ = ('shard', '__weakref__')
+
+    def __init__(self, shard):
+        self.shard = shard
+
+
+class RequestMetrics(object):
+    """Request instrumentation registered by init_core.  METRICS_ROUTE is the url of the metrics (None for
+    none), with METRICS_DIR set each worker writes its counts to a file there every METRICS_INTERVAL
+    seconds.  The shards of threads that have ended are added to a retired total, so that servers starting a
+    thread per request do not accumulate shards."""
+
+    def __init__(self):
+        self.app: Flask = None
+        self.directory = None
+        self.interval = 5
+        self._shards = set()
+        self._retired = merge([])
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+
+    def init_app(self, app: Flask):
+        app.config.setdefault('METRICS_ROUTE', '/metrics')
+        app.config.setdefault('METRICS_DIR', None)
+        app.config.setdefault('METRICS_INTERVAL', 5)
+        self.app = app
+        self.directory = app.config['METRICS_DIR']
+        self.interval = app.config['METRICS_INTERVAL']
+        app.before_request(self.before_request)
+        app.after_request(self.after_request)
+        app.teardown_request(self.teardown_request)
+        if app.config['METRICS_ROUTE']:
+            app.add_url_rule(app.config['METRICS_ROUTE'], 'metrics', self.view)
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+            atexit.register(self.stop)
+
+    @property
+    def shard(self) -> _Shard:
+        owner = getattr(self._local, 'owner', None)
+        if owner is None:
+            owner = self._local.owner = _Owner(_Shard())
+            weakref.finalize(owner, self._retire, owner.shard)
+            with self._lock:
+                self._shards.add(owner.shard)
+                if self.directory and self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name='metrics', daemon=True)
+                    self._thread.start()
+        return owner.shard
+
+    def _retire(self, shard: _Shard):
+        # The shard's thread has ended, nothing writes to it any more
+        with self._lock:
+            self._shards.discard(shard)
+            self._retired = merge([self._retired, shard.counts()])
+
+    def before_request(self):
+        g.metrics_start = time.perf_counter()
+        g.metrics_endpoint = request.endpoint or 'unmatched'
+        self.shard.inflight[g.metrics_endpoint] += 1
+
+    def after_request(self, response):
+        g.metrics_status = response.status_code
+        g.metrics_size = None if response.is_streamed else response.calculate_content_length()
+        return response
+
+    def teardown_request(self, exc):
+        if 'metrics_start' not in g:
+            return
+        elapsed = time.perf_counter() - g.metrics_start
+        shard = self.shard
+        shard.inflight[g.metrics_endpoint] -= 1
+        key = (g.metrics_endpoint, g.get('grid_cmd', None) or '')
+        latency = shard.latency.get(key, None)
+        if latency is None:
+            latency = shard.latency[key] = [0] * (len(BUCKETS) + 1) + [0.0]
+        for i, bound in enumerate(BUCKETS):
+            if elapsed <= bound:
+                latency[i] += 1
+                break
+        else:
+            latency[len(BUCKETS)] += 1
+        latency[-1] += elapsed
+        size = g.get('metrics_size', None)
+        if size is not None:
+            sizes = shard.sizes.get(key, None)
+            if sizes is None:
+                sizes = shard.sizes[key] = [0, 0]
+            sizes[0] += 1
+            sizes[1] += size
+        status = 500 if exc is not None else g.get('metrics_status', 500)
+        if status >= 400:
+            shard.errors[key + (status,)] += 1
+
+    def snapshot(self) -> Dict:
+        """Returns this worker's counts, the sum of its threads' shards."""
+        with self._lock:
+            counts = [self._retired] + [shard.counts() for shard in self._shards]
+        return merge(counts)
+
+    def collect(self) -> Dict:
+        """Returns the counts of all workers publishing to METRICS_DIR (or of this worker without one).
+        Requests in flight are only counted for workers that are still running."""
+        snapshots = [self.snapshot()]
+        if self.directory:
+            for path in glob.glob(os.path.join(self.directory, 'metrics-*.json')):
+                try:
+                    pid = int(os.path.basename(path)[8:-5])
+                    if pid == os.getpid():
+                        continue
+                    with open(path) as f:
+                        snapshot = loads(f.read())
+                except (OSError, ValueError, TypeError, KeyError):
+                    continue
+                if not _running(pid):
+                    snapshot['inflight'] = {}
+                snapshots.append(snapshot)
+        return merge(snapshots)
+
+    def publish(self):
+        """Write this worker's counts to METRICS_DIR."""
+        path = os.path.join(self.directory, 'metrics-%d.json' % os.getpid())
+        with open(path + '.tmp', 'w') as f:
+            f.write(dumps(self.snapshot()))
+        os.replace(path + '.tmp', path)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.publish()
+            except OSError:
+                self.app.logger.exception("Writing metrics failed")
+
+    def stop(self):
+        self._stop.set()
+        try:
+            self.publish()
+        except OSError:
+            pass
+
+    def view(self):
+        return Response(exposition(self.collect()), mimetype='text/plain; version=0.0.4')
+
+
+def merge(snapshots) -> Dict:
+    """Sum snapshots of counts."""
+    total = dict(latency={}, sizes={}, errors=defaultdict(int), inflight=defaultdict(int))
+    for snapshot in snapshots:
+        for name in ('latency', 'sizes'):
+            for key, values in snapshot[name].items():
+                current = total[name].get(key, None)
+                total[name][key] = list(values) if current is None else [a + b for a, b in zip(current, values)]
+        for name in ('errors', 'inflight'):
+            for key, value in snapshot[name].items():
+                total[name][key] += value
+    return total
+
+
+def dumps(snapshot: Dict) -> str:
+    """Serialize a snapshot to JSON, its keys as lists."""
+    return json.dumps({name: [[list(key) if isinstance(key, tuple) else key, value] for key, value in counts.items()]
+                       for name, counts in snapshot.items()})
+
+
+def loads(text: str) -> Dict:
+    """Deserialize a snapshot written by dumps.  Raises ValueError, TypeError or KeyError if it is not one."""
+    data = json.loads(text)
+    snapshot = {}
+    for name, size in (('latency', 2), ('sizes', 2), ('errors', 3), ('inflight', None)):
+        counts = snapshot[name] = {}
+        for key, value in data[name]:
+            if size is not None:
+                if not isinstance(key, list) or len(key) != size:
+                    raise ValueError("Bad %s key: %r" % (name, key))
+                key = tuple(key)
+            counts[key] = value
+    return snapshot
+
+
+def _running(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _labels(**labels):
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for v in labels.values())
+    return "{%s}" % ",".join('%s="%s"' % (k, v) for k, v in zip(labels.keys(), escaped))
+
+
+def exposition(counts: Dict) -> str:
+    """Format counts in the Prometheus text exposition format."""
+    lines = ["# HELP core_request_duration_seconds Request latency by endpoint and grid command.",
+             "# TYPE core_request_duration_seconds histogram"]
+    for (endpoint, cmd), values in sorted(counts['latency'].items()):
+        cumulative = 0
+        for bound, count in zip(BUCKETS + ('+Inf',), values):
+            cumulative += count
+            lines.append("core_request_duration_seconds_bucket%s %d"
+                         % (_labels(endpoint=endpoint, cmd=cmd, le=bound), cumulative))
+        lines.append("core_request_duration_seconds_sum%s %r" % (_labels(endpoint=endpoint, cmd=cmd), values[-1]))
+        lines.append("core_request_duration_seconds_count%s %d" % (_labels(endpoint=endpoint, cmd=cmd), cumulative))
+
+    lines += ["# HELP core_response_size_bytes Size of responses with a known length.",
+              "# TYPE core_response_size_bytes summary"]
+    for (endpoint, cmd), (count, total) in sorted(counts['sizes'].items()):
+        lines.append("core_response_size_bytes_sum%s %d" % (_labels(endpoint=endpoint, cmd=cmd), total))
+        lines.append("core_response_size_bytes_count%s %d" % (_labels(endpoint=endpoint, cmd=cmd), count))
+
+    lines += ["# HELP core_request_errors_total Responses with an error status.",
+              "# TYPE core_request_errors_total counter"]
+    for (endpoint, cmd, status), count in sorted(counts['errors'].items()):
+        lines.append("core_request_errors_total%s %d" % (_labels(endpoint=endpoint, cmd=cmd, status=status), count))
+
+    lines += ["# HELP core_requests_in_flight Requests being handled.",
+              "# TYPE core_requests_in_flight gauge"]
+    for endpoint, count in sorted(counts['inflight'].items()):
+        lines.append("core_requests_in_flight%s %d" % (_labels(endpoint=endpoint), count))
+    return "\n".join(lines) + "\n"
+
+
+request_metrics = RequestMetrics()
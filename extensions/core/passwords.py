@@ -0,0 +1,90 @@
+"""
+Identification
+    Module:     passwords.py
+    Author:     Victor Puska
+    Written:    Oct 19, 2026
+    Copyright:  (c) 2026 by VICTOR PUSKA.
+    License:    LICENSE_NAME, see LICENSE_FILE for more details.
+
+Description
+    Password hashing and verification on a small process pool, so that a burst of logins does not hold the
+    GIL of the web worker.  The hash method and cost are configurable; hashes made with other parameters are
+    reported by needs_rehash so they can be upgraded at the next successful login.
+"""
+
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from flask import Flask
+from werkzeug.security import generate_password_hash, check_password_hash
+
+
+class HasherBusy(Exception):
+    """Raised when the hashing queue stays full for PASSWORD_QUEUE_TIMEOUT seconds."""
+    pass
+
+
+class PasswordHasher(object):
+    """Hashes and checks passwords with werkzeug.security on PASSWORD_PROCESSES worker processes.  At most
+    PASSWORD_QUEUE requests wait for a worker, further requests wait for a slot and then fail with HasherBusy.
+    With PASSWORD_PROCESSES 0, or before init_app, hashing runs in the calling thread."""
+
+    def __init__(self):
+        self.app: Flask = None
+        self._pool = None
+        self._slots = None
+        self._method = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app: Flask):
+        app.config.setdefault('PASSWORD_METHOD', 'scrypt')
+        app.config.setdefault('PASSWORD_PROCESSES', 2)
+        app.config.setdefault('PASSWORD_QUEUE', 32)
+        app.config.setdefault('PASSWORD_QUEUE_TIMEOUT', 5)
+        self.app = app
+        self._method = None
+
+    @property
+    def method(self):
+        """The configured method with all of its parameters, as it appears in the hashes it makes."""
+        if self._method is None:
+            method = self.app.config['PASSWORD_METHOD'] if self.app is not None else 'scrypt'
+            self._method = generate_password_hash('', method).split('$')[0]
+        return self._method
+
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None and self.app is not None and self.app.config['PASSWORD_PROCESSES'] > 0:
+                config = self.app.config
+                self._slots = threading.BoundedSemaphore(config['PASSWORD_PROCESSES'] + config['PASSWORD_QUEUE'])
+                self._pool = ProcessPoolExecutor(config['PASSWORD_PROCESSES'],
+                                                 mp_context=multiprocessing.get_context('spawn'))
+            return self._pool
+
+    def _run(self, f, *args):
+        pool = self.pool
+        if pool is None:
+            return f(*args)
+        if not self._slots.acquire(timeout=self.app.config['PASSWORD_QUEUE_TIMEOUT']):
+            raise HasherBusy()
+        try:
+            future = pool.submit(f, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda f: self._slots.release())
+        return future.result()
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, pwhash, password):
+        return self._run(check_password_hash, pwhash, password)
+
+    def needs_rehash(self, pwhash):
+        return pwhash is not None and pwhash.split('$')[0] != self.method
+
+
+hasher = PasswordHasher()
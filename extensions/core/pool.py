@@ -0,0 +1,107 @@
+"""
+Identification
+    Module:     pool.py
+    Author:     Victor Puska
+    Written:    Oct 19, 2026
+    Copyright:  (c) 2026 by VICTOR PUSKA.
+    License:    LICENSE_NAME, see LICENSE_FILE for more details.
+
+Description
+    Database connection pool configuration and telemetry: a QueuePool that counts checkouts, new connections,
+    invalidations, timeouts and the time requests wait for a connection.
+"""
+
+import threading
+import time
+from typing import Dict
+
+from flask import Flask
+from sqlalchemy import event, exc
+from sqlalchemy.engine import make_url, Engine
+from sqlalchemy.pool import QueuePool
+
+
+class PoolMetrics(object):
+    """Counters of a connection pool, kept across the pool being recreated by engine.dispose()."""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.soft_invalidations = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self._lock = threading.Lock()
+
+    def checkout(self, wait):
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+
+    def count(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def as_dict(self) -> Dict:
+        with self._lock:
+            return dict(checkouts=self.checkouts, connects=self.connects, invalidations=self.invalidations,
+                        soft_invalidations=self.soft_invalidations, timeouts=self.timeouts,
+                        wait_avg_ms=self.wait_total / self.checkouts * 1000.0 if self.checkouts else 0.0,
+                        wait_max_ms=self.wait_max * 1000.0)
+
+
+class MeteredQueuePool(QueuePool):
+    """QueuePool recording PoolMetrics.  The wait of a checkout is the time taken by connect(), including the
+    pre-ping and opening a new connection when the pool has none idle."""
+
+    def __init__(self, *args, **kwargs):
+        recreated = '_dispatch' in kwargs
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+        if not recreated:
+            # A recreated pool shares its predecessor's listeners (and, see recreate, its metrics)
+            event.listen(self, 'connect', lambda *args: self.metrics.count('connects'))
+            event.listen(self, 'invalidate', lambda *args: self.metrics.count('invalidations'))
+            event.listen(self, 'soft_invalidate', lambda *args: self.metrics.count('soft_invalidations'))
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.metrics.count('timeouts')
+            raise
+        self.metrics.checkout(time.perf_counter() - start)
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+def init_pool(app: Flask):
+    """Use MeteredQueuePool for the application's database when it would use a QueuePool and no poolclass is
+    configured.  Must be called before db.init_app, the pool is sized by SQLALCHEMY_ENGINE_OPTIONS."""
+    options = app.config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', {})
+    uri = app.config.get('SQLALCHEMY_DATABASE_URI', None)
+    if uri is None or 'poolclass' in options:
+        return
+    url = make_url(uri)
+    if url.get_dialect().get_pool_class(url) is QueuePool:
+        options['poolclass'] = MeteredQueuePool
+
+
+def pool_status(engine: Engine) -> Dict:
+    """Returns the state of the engine's pool: connections checked out, idle and in overflow, and, for a
+    MeteredQueuePool, its metrics."""
+    pool = engine.pool
+    status = dict(pool=type(pool).__name__)
+    if isinstance(pool, QueuePool):
+        status.update(size=pool.size(), checked_out=pool.checkedout(), idle=pool.checkedin(),
+                      overflow=max(pool.overflow(), 0))
+    if isinstance(pool, MeteredQueuePool):
+        status.update(pool.metrics.as_dict())
+    return status
@@ -0,0 +1,66 @@
+"""
+Identification
+    Module:     routing.py
+    Author:     Victor Puska
+    Written:    Oct 19, 2026
+    Copyright:  (c) 2026 by VICTOR PUSKA.
+    License:    LICENSE_NAME, see LICENSE_FILE for more details.
+
+Description
+    Session routing reads to a read replica.  Statements marked with the 'replica' execution option (see
+    on_replica) run on the SQLALCHEMY_BINDS 'replica' engine when one is configured, everything else runs on
+    the primary database.
+"""
+
+import time
+
+from flask import current_app, has_request_context, session as flask_session
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.sql.dml import UpdateBase
+
+
+REPLICA_BIND = 'replica'            # SQLALCHEMY_BINDS key of the read replica
+STICKY_KEY = '_primary_until'       # Flask session key holding the end of the user's read-your-writes window
+
+
+def on_replica(q):
+    """Mark a query (or statement) as a read that may be served by the replica."""
+    return q.execution_options(replica=True)
+
+
+def stick():
+    """Send the current user's replica reads to the primary for REPLICA_STICKY_SECONDS, so that they read
+    their own writes while the replica catches up."""
+    if has_request_context():
+        flask_session[STICKY_KEY] = time.time() + current_app.config.get('REPLICA_STICKY_SECONDS', 5)
+
+
+def sticky():
+    return has_request_context() and flask_session.get(STICKY_KEY, 0) > time.time()
+
+
+class RoutingSession(Session):
+    """Flask-SQLAlchemy session choosing the replica for reads marked with on_replica, unless this session
+    has written in its current transaction or the user wrote within the stickiness window."""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and clause is not None:
+            if isinstance(clause, UpdateBase):
+                stick()
+            elif clause.get_execution_options().get('replica', False) and REPLICA_BIND in self._db.engines \
+                    and not self.info.get('wrote', False) and not sticky():
+                return self._db.engines[REPLICA_BIND]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _after_flush(session, flush_context):
+    session.info['wrote'] = True
+    stick()
+
+
+@event.listens_for(RoutingSession, "after_commit")
+@event.listens_for(RoutingSession, "after_rollback")
+def _end_transaction(session):
+    session.info.pop('wrote', None)
@@ -0,0 +1,116 @@
+"""
+Identification
+    Module:     seed.py
+    Author:     Victor Puska
+    Written:    Oct 19, 2026
+    Copyright:  (c) 2026 by VICTOR PUSKA.
+    License:    LICENSE_NAME, see LICENSE_FILE for more details.
+
+Description
+    Deterministic synthetic User and Items rows for benchmarking and profiling at production scale.
+"""
+
+import datetime
+import random
+import string
+from collections import Counter
+from typing import List
+
+from sqlalchemy import func, update, bindparam
+
+from . database import session, User, Items
+
+
+USER_TYPES = ['User', 'ADMIN', 'SUPER']
+SYLLABLES = ['ka', 'lo', 'mi', 'ne', 'ru', 'sa', 'ti', 'vo', 'an', 'el', 'is', 'or', 'us', 'ber', 'dan', 'gor']
+
+
+class Seeder(object):
+    """Generates and bulk inserts synthetic rows.  The same seed and options always produce the same rows.
+
+        :param seed:            Random seed
+        :param name_length:     Tuple (min, max) length of generated names
+        :param types:           Number of distinct user types
+        :param days:            Created dates are spread over this many days before `now`
+        :param dates:           'uniform' or 'recent' (exponentially more rows in recent days)
+        :param owners:          Number of distinct users owning items, None for all users
+        :param skew:            Zipf exponent of items per owner, 0 spreads items evenly
+        :param batch_size:      Rows per multi-row INSERT
+    """
+
+    def __init__(self, seed=0, name_length=(5, 30), types=3, days=365, dates='uniform', owners=None, skew=0.0,
+                 batch_size=500, now=datetime.datetime(2026, 1, 1)):
+        self.random = random.Random(seed)
+        self.name_length = name_length
+        self.types = USER_TYPES[:types] + ['TYPE%d' % i for i in range(len(USER_TYPES), types)]
+        self.days = days
+        self.dates = dates
+        self.owners = owners
+        self.skew = skew
+        self.batch_size = batch_size
+        self.now = now
+
+    def name(self):
+        length = self.random.randint(*self.name_length)
+        words = []
+        while sum(len(w) + 1 for w in words) < length:
+            words.append(''.join(self.random.choice(SYLLABLES) for _ in range(self.random.randint(1, 4))).title())
+        return ' '.join(words)[:length]
+
+    def date(self):
+        if self.dates == 'recent':
+            age = min(self.random.expovariate(5.0 / self.days), self.days)
+        else:
+            age = self.random.uniform(0, self.days)
+        return self.now - datetime.timedelta(days=age)
+
+    def user(self, n):
+        name = self.name()
+        created = self.date()
+        return dict(code='u%07d%s' % (n, self.random.choice(string.ascii_lowercase)),
+                    name=name,
+                    email="%s@example.com" % name.lower().replace(' ', '.'),
+                    active=self.random.random() < 0.9,
+                    type=self.random.choice(self.types),
+                    created=created,
+                    lastaccess=created + datetime.timedelta(hours=self.random.uniform(0, 24 * 30))
+                    if self.random.random() < 0.7 else None,
+                    item_count=0)
+
+    def owner_weights(self, count):
+        return [1.0 / (rank ** self.skew) for rank in range(1, count + 1)]
+
+    def _insert(self, table, rows: List[dict]):
+        for i in range(0, len(rows), self.batch_size):
+            session.execute(table.insert().values(rows[i:i + self.batch_size]))
+
+    def seed_users(self, count):
+        """Insert count users, committing every batch.  Returns the list of new user ids."""
+        first = (session.query(func.max(User.id)).scalar() or 0) + 1
+        table = User.__table__
+        for start in range(0, count, self.batch_size):
+            self._insert(table, [self.user(first + n) for n in range(start, min(start + self.batch_size, count))])
+            session.commit()
+        return [row[0] for row in session.query(User.id).filter(User.id >= first).order_by(User.id)]
+
+    def seed_items(self, count, user_ids: List[int]):
+        """Insert count items owned by users in user_ids and update the users' item_count."""
+        owners = user_ids[:self.owners] if self.owners else user_ids
+        weights = self.owner_weights(len(owners)) if self.skew else None
+        table = Items.__table__
+        counts = Counter()
+        for start in range(0, count, self.batch_size):
+            size = min(self.batch_size, count - start)
+            userids = self.random.choices(owners, weights=weights, k=size) if owners else [None] * size
+            counts.update(userids)
+            self._insert(table, [dict(name=self.name(), userid=userid) for userid in userids])
+            session.commit()
+        counts.pop(None, None)
+        # The item counts are known here, set them directly rather than rebuilding the maintained aggregate.
+        stmt = update(User.__table__) \
+            .where(User.__table__.c.id == bindparam('_id')) \
+            .values(item_count=User.__table__.c.item_count + bindparam('_count'))
+        changes = [dict(_id=userid, _count=n) for userid, n in counts.items()]
+        for i in range(0, len(changes), self.batch_size):
+            session.execute(stmt, changes[i:i + self.batch_size])
+        session.commit()
@@ -0,0 +1,146 @@
+"""
+Identification
+    Module:     throttle.py
+    Author:     Victor Puska
+    Written:    Oct 19, 2026
+    Copyright:  (c) 2026 by VICTOR PUSKA.
+    License:    LICENSE_NAME, see LICENSE_FILE for more details.
+
+Description
+    Token bucket throttling of sign in attempts per username and per client address.  Buckets are kept in
+    the worker's memory, or in a local SQLite file shared by the workers of a host.
+"""
+
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from flask import Flask, Request
+
+
+class MemoryStore(object):
+    """Buckets of one worker process, the least recently used are dropped beyond maxsize."""
+
+    def __init__(self, maxsize=100000):
+        self.maxsize = maxsize
+        self._buckets = OrderedDict()   # key -> (tokens, time)
+        self._lock = threading.Lock()
+
+    def take(self, key, rate, burst, now):
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (burst, now))
+            tokens = min(burst, tokens + (now - updated) * rate)
+            allowed = tokens >= 1.0
+            self._buckets[key] = (tokens - 1.0 if allowed else tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+            return allowed
+
+
+class FileStore(object):
+    """Buckets in a SQLite file shared by the worker processes of a host.  Each take is one short write
+    transaction; buckets that have refilled are deleted now and then."""
+
+    PURGE_INTERVAL = 60.0
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        self._purged = 0.0
+        self._connect().execute("CREATE TABLE IF NOT EXISTS bucket "
+                                "(key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)")
+
+    def _connect(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            connection = self._local.connection = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+        return connection
+
+    def take(self, key, rate, burst, now):
+        connection = self._connect()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = connection.execute("SELECT tokens, updated FROM bucket WHERE key = ?", (key,)).fetchone()
+            tokens, updated = row if row is not None else (burst, now)
+            tokens = min(burst, tokens + (now - updated) * rate)
+            allowed = tokens >= 1.0
+            connection.execute("INSERT OR REPLACE INTO bucket (key, tokens, updated) VALUES (?, ?, ?)",
+                               (key, tokens - 1.0 if allowed else tokens, now))
+            if now - self._purged > self.PURGE_INTERVAL:
+                self._purged = now
+                connection.execute("DELETE FROM bucket WHERE updated < ?", (now - burst / rate,))
+            connection.execute("COMMIT")
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+        return allowed
+
+
+class LoginThrottle(object):
+    """Allows each username LOGIN_BURST sign in attempts at once, refilled at LOGIN_RATE attempts per minute,
+    and each client address LOGIN_ADDRESS_BURST attempts refilled at LOGIN_ADDRESS_RATE (an address may be
+    shared by many users behind a NAT).  LOGIN_THROTTLE_FILE shares the buckets between workers through a
+    SQLite file, otherwise each worker keeps its own.
+
+    Behind reverse proxies the connection's address is the nearest proxy's.  LOGIN_TRUSTED_PROXIES is the
+    number of proxies that append the client's address to X-Forwarded-For, the client address is then read
+    from that header.  The header is ignored when it is 0, since clients can set it to anything."""
+
+    def __init__(self):
+        self.rate = 10 / 60.0
+        self.burst = 10
+        self.address_rate = 30 / 60.0
+        self.address_burst = 30
+        self.trusted_proxies = 0
+        self.store = MemoryStore()
+        self.allowed = 0
+        self.throttled_user = 0
+        self.throttled_address = 0
+        self._lock = threading.Lock()
+
+    def init_app(self, app: Flask):
+        app.config.setdefault('LOGIN_RATE', 10)
+        app.config.setdefault('LOGIN_BURST', 10)
+        app.config.setdefault('LOGIN_ADDRESS_RATE', 30)
+        app.config.setdefault('LOGIN_ADDRESS_BURST', 30)
+        app.config.setdefault('LOGIN_TRUSTED_PROXIES', 0)
+        app.config.setdefault('LOGIN_THROTTLE_FILE', None)
+        self.rate = app.config['LOGIN_RATE'] / 60.0
+        self.burst = app.config['LOGIN_BURST']
+        self.address_rate = app.config['LOGIN_ADDRESS_RATE'] / 60.0
+        self.address_burst = app.config['LOGIN_ADDRESS_BURST']
+        self.trusted_proxies = app.config['LOGIN_TRUSTED_PROXIES']
+        path = app.config['LOGIN_THROTTLE_FILE']
+        self.store = FileStore(path) if path else MemoryStore()
+
+    def client_address(self, request: Request):
+        """Returns the address of the client making request, as seen by the outermost trusted proxy."""
+        if self.trusted_proxies:
+            forwarded = [a.strip() for a in request.headers.get('X-Forwarded-For', '').split(',') if a.strip()]
+            if len(forwarded) >= self.trusted_proxies:
+                return forwarded[-self.trusted_proxies]
+        return request.remote_addr
+
+    def allow(self, username, address):
+        """Take a token from the address's and the username's buckets, returns False if either is empty."""
+        now = time.time()
+        if not self.store.take('a:%s' % address, self.address_rate, self.address_burst, now):
+            counter = 'throttled_address'
+        elif not self.store.take('u:%s' % username.lower(), self.rate, self.burst, now):
+            counter = 'throttled_user'
+        else:
+            counter = 'allowed'
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+        return counter == 'allowed'
+
+    def counters(self):
+        with self._lock:
+            return dict(login_allowed=self.allowed, login_throttled_user=self.throttled_user,
+                        login_throttled_address=self.throttled_address)
+
+
+login_throttle = LoginThrottle()
@@ -11,23 +11,25 @@ Description
 """
 
 import urllib
+from collections import namedtuple
 from flask import Flask, url_for
 
 
+Route = namedtuple('Route', ['endpoint', 'methods', 'url'])
+
+
 def get_routes(app: Flask):
-    """Return an array of tuples (endpoint, methods and url) listing the application routes"""
-    rules = []
-    args = {}
-    for rule in app.url_map.iter_rules():
-        for arg in rule.arguments:
-            args[arg] = "[{0}]".format(arg)
-        entry = (
-            rule.endpoint, #endpoint
-            ",".join(rule.methods), #methods
-            urllib.parse.unquote(url_for(rule.endpoint,**args)) #url
-        )
-        rules.append(entry)
-    return rules
+    """Return an array of tuples (endpoint, methods and url) listing the application routes.  The table is
+    built on first use and kept, routes cannot be added once the application has handled a request."""
+    routes = app.extensions.get('core_routes', None)
+    if routes is None:
+        routes = []
+        for rule in app.url_map.iter_rules():
+            args = {arg: "[{0}]".format(arg) for arg in rule.arguments}
+            url = urllib.parse.unquote(url_for(rule.endpoint, **args))
+            routes.append(Route(rule.endpoint, ",".join(rule.methods), url))
+        app.extensions['core_routes'] = routes
+    return routes
 
 
 def get_datetime_format():
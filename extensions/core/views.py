@@ -10,16 +10,23 @@ Description
     Authentication and authority management for the application.
 """
 import sys
-import urllib
 
-from flask import render_template, redirect, flash, url_for, current_app
+from flask import render_template, redirect, flash, url_for, current_app, jsonify, abort, send_file, request
 from flask_login import current_user, login_user, logout_user, login_required
 from flask_wtf import FlaskForm
 
 from wtforms import StringField, PasswordField, BooleanField, SubmitField
 from wtforms.validators import DataRequired
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
 
 from . database import User, session, db
+from . jobs import job_queue
+from . pool import pool_status
+from . warmup import is_ready
+from . passwords import hasher, HasherBusy
+from . throttle import login_throttle
+from . util import get_routes
 from . import blueprint
 
 
@@ -32,34 +39,34 @@ class LoginForm(FlaskForm):
 
 @blueprint.route("/")
 def index():
-    output = []
-    for rule in current_app.url_map.iter_rules():
-        options = {}
-        for arg in rule.arguments:
-            options[arg] = "[{0}]".format(arg)
-        obj = {
-            'endpoint': rule.endpoint,
-            'methods': ','.join(rule.methods),
-            'url': urllib.parse.unquote(url_for(rule.endpoint, **options))
-        }
-        output.append(obj)
+    page = max(request.args.get('page', 1, type=int), 1)
+    size = current_app.config.get('INDEX_PAGE_SIZE', 50)
+    current_id = current_user.id if current_user.is_authenticated else None
+    q = session.query(User.id, User.name, User.active, User.created).order_by(User.id)
     users = []
-    for u in session.query(User).all():
-        current = current_user
-        if current.is_authenticated:
-            u.is_current = (current.id == u.id)
-        else:
-            u.is_current = False
-        users.append(u)
-    return render_template('index.html ', pypath=sys.path, urlmap=output, users=users, user=current)
+    for u in q.offset((page - 1) * size).limit(size + 1):
+        users.append(dict(u._mapping, is_current=(u.id == current_id)))
+    more = len(users) > size
+    return render_template('index.html', pypath=sys.path, urlmap=get_routes(current_app), users=users[:size],
+                           page=page, more=more, user=current_user)
 
 @blueprint.route('/login', methods=['GET', 'POST'])
 def login():
     form = LoginForm()
     if form.validate_on_submit():
+        if not login_throttle.allow(form.username.data, login_throttle.client_address(request)):
+            flash('Too many sign in attempts, please wait a minute and try again')
+            return render_template('login.html', title='Sign In', form=form), 429
         user = User.query.filter_by(code=form.username.data).first()
-        if user is None or not user.check_password(form.password.data):
-            flash('Invalid username or password')
+        try:
+            if user is None or not user.check_password(form.password.data):
+                flash('Invalid username or password')
+                return redirect(url_for('.login'))
+            if hasher.needs_rehash(user.password):
+                user.set_password(form.password.data)
+                session.commit()
+        except HasherBusy:
+            flash('Too many sign in attempts, please try again')
             return redirect(url_for('.login'))
         if current_user.is_authenticated:
             logout_user()
@@ -80,15 +87,37 @@ def logged_out():
 
 @blueprint.route("/diagnostics")
 def diagnostics():
-    output = []
-    for rule in current_app.url_map.iter_rules():
-        options = {}
-        for arg in rule.arguments:
-            options[arg] = "[{0}]".format(arg)
-        obj = {
-            'endpoint': rule.endpoint,
-            'methods': ','.join(rule.methods),
-            'url': urllib.parse.unquote(url_for(rule.endpoint, **options))
-        }
-        output.append(obj)
-    return render_template('diagnostics.html', urlmap=output, user=current_user)
\ No newline at end of file
+    return render_template('diagnostics.html', urlmap=get_routes(current_app), user=current_user,
+                           pool=pool_status(db.engine), throttle=login_throttle.counters())
+
+@blueprint.route("/ready")
+def ready():
+    """Readiness probe: 200 once the worker has warmed up and if a pooled database connection answers,
+    otherwise 503."""
+    if not is_ready(current_app):
+        return jsonify(dict(status="warming up")), 503
+    try:
+        with db.engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+    except SQLAlchemyError as e:
+        return jsonify(dict(status="error", message=str(e))), 503
+    return jsonify(dict(status="ready"))
+
+@blueprint.route("/jobs/<id>")
+def job_status(id):
+    job = job_queue.job(id) or abort(404)
+    return jsonify(dict(status="success", job=job.load()))
+
+@blueprint.route("/jobs/<id>/cancel", methods=['POST'])
+def job_cancel(id):
+    job = job_queue.job(id) or abort(404)
+    job.cancel()
+    return jsonify(dict(status="success", job=job.load()))
+
+@blueprint.route("/jobs/<id>/result")
+def job_result(id):
+    job = job_queue.job(id) or abort(404)
+    state = job.load()
+    if state['status'] != 'done' or not state.get('result'):
+        abort(404)
+    return send_file(state['result'], as_attachment=True, download_name=state['filename'])
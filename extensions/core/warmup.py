@@ -0,0 +1,102 @@
+"""
+Identification
+    Module:     warmup.py
+    Author:     Victor Puska
+    Written:    Oct 19, 2026
+    Copyright:  (c) 2026 by VICTOR PUSKA.
+    License:    LICENSE_NAME, see LICENSE_FILE for more details.
+
+Description
+    Optional warm-up of a new worker: open the pools' connections, compile and cache the grid views'
+    statements and load the templates, before the worker reports itself ready.
+"""
+
+import threading
+import time
+
+from flask import Flask
+from sqlalchemy import text
+from sqlalchemy.pool import QueuePool
+
+from . database import db, session
+
+
+def init_warmup(app: Flask):
+    """If WARMUP is set, warm up in a background thread when the application starts serving (its first request),
+    so that CLI commands and the pools' worker processes, which never serve, do not warm up.  The worker is
+    ready (see is_ready) when the warm-up has finished, or at once without one."""
+    ready = threading.Event()
+    app.extensions['core_ready'] = ready
+    if not app.config.get('WARMUP', False):
+        ready.set()
+        return
+    started = threading.Lock()     # Taken by the first request and never released
+
+    def start():
+        if started.acquire(blocking=False):
+            threading.Thread(target=warm_up, args=(app, ready), name='warmup', daemon=True).start()
+    app.before_request(start)
+
+
+def is_ready(app: Flask):
+    ready = app.extensions.get('core_ready', None)
+    return ready is None or ready.is_set()
+
+
+def warm_up(app: Flask, ready: threading.Event = None):
+    start = time.perf_counter()
+    try:
+        with app.app_context():
+            fill_pools()
+        with app.test_request_context():
+            compile_views()
+        load_templates(app)
+        app.logger.info("Warm-up finished in %.2fs", time.perf_counter() - start)
+    except Exception:
+        # A database that is down is reported by the readiness check itself
+        app.logger.exception("Warm-up failed")
+    finally:
+        if ready is not None:
+            ready.set()
+
+
+def fill_pools():
+    """Open pool_size connections on each engine and return them to the pool."""
+    for engine in db.engines.values():
+        size = engine.pool.size() if isinstance(engine.pool, QueuePool) else 1
+        connections = []
+        try:
+            for _ in range(size):
+                connection = engine.connect()
+                connections.append(connection)
+                connection.execute(text("SELECT 1"))
+        finally:
+            for connection in connections:
+                connection.close()
+
+
+def compile_views():
+    """Run each registered grid view's page statement and its totals and facets statements with LIMIT 0, and
+    its fetch by primary key.  This puts their compiled forms in the engines' statement caches without reading
+    any rows.  Views registered at several urls (the async views) are compiled once."""
+    from . grid import grid_views, grid_view
+    from . routing import on_replica
+    compiled = set()
+    for endpoint, (view_class, _) in grid_views.items():
+        if view_class in compiled:
+            continue
+        compiled.add(view_class)
+        view = grid_view(endpoint)
+        q = on_replica(view.search_query({}))
+        q.order_by(view.primarycol.model_column).offset(0).limit(0).all()
+        view.totals_query(q).limit(0).all()
+        if view.facetcols:
+            statement, _ = view.facet_statement(q, session.get_bind().dialect.name)
+            session.execute(statement.limit(0)).all()
+        view.query.filter(view.primarycol.model_column == 0).first()
+
+
+def load_templates(app: Flask):
+    """Load and compile the application's and blueprints' HTML templates into the Jinja cache."""
+    for name in app.jinja_env.list_templates(extensions=('html',)):
+        app.jinja_env.get_template(name)
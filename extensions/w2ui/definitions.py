@@ -14,6 +14,7 @@ from typing import Dict, Type
 from sqlalchemy.orm.attributes import InstrumentedAttribute
 from sqlalchemy.sql.sqltypes import Integer, String, DateTime, Boolean
 from sqlalchemy.schema import Column
+from sqlalchemy.sql import func, select
 from sqlalchemy.sql.operators import eq, gt, lt, between_op, startswith_op, endswith_op, contains_op
 
 
@@ -56,6 +57,26 @@ class W2TypeHandler(object):
     def search_operator_between(cls, model_column: Column, value):
         return between_op(model_column, value[0], value[1])
 
+    @classmethod
+    def aggregate_sum(cls, model_column: Column):
+        return func.sum(model_column)
+
+    @classmethod
+    def aggregate_avg(cls, model_column: Column):
+        return func.avg(model_column)
+
+    @classmethod
+    def aggregate_min(cls, model_column: Column):
+        return func.min(model_column)
+
+    @classmethod
+    def aggregate_max(cls, model_column: Column):
+        return func.max(model_column)
+
+    @classmethod
+    def aggregate_count(cls, model_column: Column):
+        return func.count(model_column)
+
     @classmethod
     def to_json(cls, value):
         return value
@@ -64,6 +85,19 @@ class W2TypeHandler(object):
     def from_json(cls, value):
         return value
 
+    @classmethod
+    def summary_to_json(cls, aggregate, value):
+        """Convert an aggregate result to json.  Averages and counts are plain numbers, the other
+        aggregates keep the column's type."""
+        if value is None:
+            return None
+        elif aggregate == 'avg':
+            return float(value)
+        elif aggregate == 'count':
+            return int(value)
+        else:
+            return cls.to_json(value)
+
     @classmethod
     def edit_options(cls):
         return {}
@@ -105,6 +139,10 @@ class W2IntegerHandler(W2GenericHandler):
     def column_defaults(cls, model_column: Column):
         return dict(size=32, caption=model_column.name)
 
+    @classmethod
+    def from_json(cls, value):
+        return int(value) if isinstance(value, str) else value
+
 
 class W2DateTimeHandler(W2GenericHandler):
 
@@ -131,6 +169,12 @@ class W2BooleanHandler(W2GenericHandler):
     def column_defaults(cls, model_column: Column):
         return dict(size=50, caption=model_column.name)
 
+    @classmethod
+    def from_json(cls, value):
+        if isinstance(value, str):
+            return value.strip().lower() in ('true', '1', 'yes', 'y', 't')
+        return value
+
     @classmethod
     def edit_options(cls):
         return dict(type='checkbox')
@@ -171,10 +215,18 @@ class W2Column(W2Definition):
     on the SQL column type.
 
     A default W2Column object can be set for a particular SQL model column by using the `set_defaults` method.
+
+    A column of a related model is defined by passing the relationship attributes leading to it from the view's
+    model as `path`, e.g. ``W2Column(User.code, path=Items.user)``.  When the path ends in a one to many
+    relationship the related rows are reduced by `path_aggregate`, e.g.
+    ``W2Column(Items.id, path=User.items, path_aggregate='count')``.
     """
 
     def __init__(self, field, **kwargs):
         W2Definition.__init__(self)
+        self._path = ()                 # Relationship attributes leading from the view's model to the column
+        self._path_aggregate = None     # Aggregate reducing a one to many path to a single value
+        self._lookup = None             # Column searched by the remote editor's lookup
 
         if type(field) is InstrumentedAttribute:
             # Field is a SQLAlchemy model column..
@@ -209,7 +261,16 @@ class W2Column(W2Definition):
     def filter(self, operator, value):
         search_method_name = "search_operator_" + operator
         search_method = getattr(self.handler, search_method_name, None)
-        return search_method(self.model_column, value)
+        return search_method(self.expression, value)
+
+    def summarize(self):
+        """Returns the SQL aggregate expression for the column's summary, or None if the column has no
+        aggregate."""
+        if self.aggregate is None:
+            return None
+        aggregate_method = getattr(self.handler, "aggregate_" + self.aggregate, None)
+        assert aggregate_method is not None, "Invalid aggregate for column: " + self.aggregate
+        return aggregate_method(self.expression)
 
     def column_spec(self, field: str) -> Dict:
         """Returns a dictionary representing the w2ui column specification."""
@@ -294,6 +355,52 @@ class W2Column(W2Definition):
     def model_column(self):
         return self._model
 
+    @property
+    def expression(self):
+        """The SQL expression selected for the column.  This is the model column unless the column has a
+        path aggregate, which is computed by a subquery correlated to the view's model."""
+        if self._path_aggregate is None:
+            return self._model
+        aggregate_method = getattr(self.handler, "aggregate_" + self._path_aggregate, None)
+        assert aggregate_method is not None, "Invalid path aggregate for column: " + self._path_aggregate
+        return select(aggregate_method(self._model)) \
+            .where(self._path[0].property.primaryjoin) \
+            .correlate_except(self._model.class_.__table__) \
+            .scalar_subquery()
+
+    @property
+    def path(self):
+        """Tuple of relationship attributes leading from the view's model to the column's model"""
+        return self._path
+
+    @path.setter
+    def path(self, path):
+        self._path = tuple(path) if isinstance(path, (list, tuple)) else (path,)
+
+    @property
+    def path_aggregate(self):
+        """Aggregate ('sum', 'avg', 'min', 'max' or 'count') reducing a one to many path to a single value"""
+        return self._path_aggregate
+
+    @path_aggregate.setter
+    def path_aggregate(self, aggregate):
+        self._path_aggregate = aggregate
+
+    @property
+    def lookup(self):
+        """Column searched by the editor's remote lookup.  True looks up the distinct values of the column itself,
+        a column of another model looks up (primary key, column) pairs for a foreign key."""
+        return self._lookup
+
+    @lookup.setter
+    def lookup(self, lookup):
+        self._lookup = lookup
+
+    @property
+    def is_related(self):
+        """True if the column belongs to a related model rather than the view's model"""
+        return len(self._path) > 0
+
     @property
     def nosearch(self):
         """Suppress generation of search parameters for grid"""
@@ -528,3 +635,22 @@ class W2Column(W2Definition):
     def operator(self, operator):
         self._specifications['operator'] = operator
         self._has_search_spec = True
+
+    # SUMMARY ATTRIBUTES ====
+    @property
+    def aggregate(self):
+        """Aggregate shown in the grid's summary row: 'sum', 'avg', 'min', 'max' or 'count'"""
+        return self._specifications.get('aggregate', None)
+
+    @aggregate.setter
+    def aggregate(self, aggregate):
+        self._specifications['aggregate'] = aggregate
+
+    @property
+    def facet(self):
+        """Indicates if row counts per column value are available to the search panel"""
+        return self._specifications.get('facet', None)
+
+    @facet.setter
+    def facet(self, facet):
+        self._specifications['facet'] = facet
@@ -0,0 +1,27 @@
+"""add item_count column
+
+Revision ID: 3c9e5b7a2f41
+Revises: 1db4dc72ba51
+Create Date: 2026-10-19 09:12:41.503287
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3c9e5b7a2f41'
+down_revision = '1db4dc72ba51'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('user', sa.Column('item_count', sa.Integer(), server_default='0', nullable=False))
+    op.create_index(op.f('ix_user_item_count'), 'user', ['item_count'], unique=False)
+    op.execute("UPDATE user SET item_count = (SELECT COUNT(*) FROM items WHERE items.userid = user.id)")
+
+
+def downgrade():
+    op.drop_index(op.f('ix_user_item_count'), table_name='user')
+    op.drop_column('user', 'item_count')
@@ -0,0 +1,65 @@
+"""
+Identification
+    Module:     conftest.py
+    Author:     Victor Puska
+    Written:    Oct 19, 2026
+    Copyright:  (c) 2026 by VICTOR PUSKA.
+    License:    LICENSE_NAME, see LICENSE_FILE for more details.
+
+Description
+    Fixtures of the core package's tests: an application on a temporary SQLite database, with the background
+    threads and process pools that init_core can start turned off.
+"""
+
+import os
+import sys
+
+import pytest
+from flask import Flask
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'extensions'))
+
+from core import init_core, db, session                                 # noqa: E402
+from core.grid import grid_cache, lookup_cache, projection_cache        # noqa: E402
+from core.core import user_cache                                        # noqa: E402
+
+
+@pytest.fixture
+def make_app(tmp_path):
+    """Returns a function creating an application with the given config, its tables created."""
+    apps = []
+
+    def make_app(**config):
+        app = Flask(__name__)
+        app.config.update(SQLALCHEMY_DATABASE_URI='sqlite:///%s' % (tmp_path / 'core.db'),
+                          SECRET_KEY='test',
+                          WTF_CSRF_ENABLED=False,
+                          WARMUP=False,
+                          PASSWORD_PROCESSES=0,
+                          LASTACCESS_INTERVAL=0,
+                          JOB_DIR=str(tmp_path / 'jobs'),
+                          W2GRID_CACHE_TTL=0)
+        app.config.update(config)
+        init_core(app)
+        with app.app_context():
+            db.create_all(bind_key=None)
+        apps.append(app)
+        return app
+
+    yield make_app
+    for app in apps:
+        with app.app_context():
+            session.remove()
+            db.drop_all(bind_key=None)
+    for cache in (grid_cache, lookup_cache, projection_cache, user_cache):
+        cache.clear()
+
+
+@pytest.fixture
+def app(make_app):
+    return make_app()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
@@ -0,0 +1,99 @@
+"""
+Identification
+    Module:     test_aggregates.py
+    Author:     Victor Puska
+    Written:    Oct 19, 2026
+    Copyright:  (c) 2026 by VICTOR PUSKA.
+    License:    LICENSE_NAME, see LICENSE_FILE for more details.
+
+Description
+    Maintained aggregate columns (User.item_count).
+"""
+
+import json
+
+import pytest
+from sqlalchemy import text
+
+from core import User, session
+from core.cli import core_cli_group
+from core.database import Items, user_item_count
+
+
+@pytest.fixture
+def owners(app):
+    with app.app_context():
+        session.add_all([User(code='u%d' % i) for i in range(3)])
+        session.commit()
+    return app
+
+
+def counts():
+    session.expire_all()
+    return [u.item_count for u in session.query(User).order_by(User.id)]
+
+
+def test_insert(owners):
+    with owners.app_context():
+        u1, u2, u3 = session.query(User).order_by(User.id)
+        session.add_all([Items(name='a', user=u1), Items(name='b', user=u1), Items(name='c', userid=u2.id),
+                         Items(name='d')])
+        session.commit()
+        assert counts() == [2, 1, 0]
+
+
+def test_reassign(owners):
+    with owners.app_context():
+        u1, u2, u3 = session.query(User).order_by(User.id)
+        a, b, c = Items(name='a', user=u1), Items(name='b', user=u1), Items(name='c', userid=u2.id)
+        session.add_all([a, b, c])
+        session.commit()
+        a.user = u3                     # Through the relationship
+        session.commit()
+        assert counts() == [1, 1, 1]
+        c.userid = u1.id                # Through the foreign key
+        session.commit()
+        assert counts() == [2, 0, 1]
+        b.userid = None
+        session.commit()
+        assert counts() == [1, 0, 1]
+        b.name = 'renamed'              # Other changes leave the counts alone
+        session.commit()
+        assert counts() == [1, 0, 1]
+
+
+def test_delete(owners, client):
+    with owners.app_context():
+        session.add_all([Items(name='a', userid=1), Items(name='b', userid=1), Items(name='c', userid=2)])
+        session.commit()
+        session.delete(session.get(Items, 1))
+        session.commit()
+        assert counts() == [1, 1, 0]
+    # Grid deletes and saves go through the ORM flush
+    client.post('/items', data={'request': json.dumps(dict(cmd='delete', selected=[3]))})
+    client.post('/items', data={'request': json.dumps(dict(cmd='save', changes=[dict(recid=2, userid=3)]))})
+    with owners.app_context():
+        assert counts() == [0, 0, 1]
+
+
+def test_rebuild(owners):
+    with owners.app_context():
+        session.add_all([Items(name='a', userid=1), Items(name='b', userid=1), Items(name='c', userid=3)])
+        session.commit()
+        session.execute(text("UPDATE user SET item_count = 99"))
+        session.commit()
+        assert list(user_item_count.rebuild(session, batch_size=2)) == [2, 1]
+        assert counts() == [2, 0, 1]
+        session.execute(text("UPDATE user SET item_count = 99"))
+        session.commit()
+        assert list(user_item_count.rebuild(session, parent_ids=[3])) == [1]
+        assert counts() == [99, 99, 1]
+
+
+def test_import_rebuilds(owners, tmp_path):
+    path = tmp_path / 'items.csv'
+    path.write_text("name,userid\na,1\nb,1\nc,2\n")
+    result = owners.test_cli_runner().invoke(core_cli_group, ['import', 'items', str(path)])
+    assert result.exit_code == 0, result.output
+    with owners.app_context():
+        assert counts() == [2, 1, 0]
@@ -0,0 +1,75 @@
+"""
+Identification
+    Module:     test_asyncgrid.py
+    Author:     Victor Puska
+    Written:    Oct 19, 2026
+    Copyright:  (c) 2026 by VICTOR PUSKA.
+    License:    LICENSE_NAME, see LICENSE_FILE for more details.
+
+Description
+    AsyncW2GridView requests: lists, saves and deletes.
+"""
+
+import json
+
+import pytest
+
+from core import User, session
+from core.asyncdb import available
+
+pytestmark = pytest.mark.skipif(not available(), reason="Async grid views need greenlet and an async driver")
+
+
+def post(client, url='/async/users', **w2req):
+    response = client.post(url, data={'request': json.dumps(w2req)})
+    assert response.status_code == 200
+    result = response.get_json()
+    assert result['status'] == 'success', result
+    return result
+
+
+@pytest.fixture
+def users(app):
+    with app.app_context():
+        session.add_all([User(code='u%d' % i, name='User %d' % i, type='ADMIN' if i % 2 else 'SUPER')
+                         for i in range(7)])
+        session.commit()
+    return app
+
+
+def test_list(users, client):
+    result = post(client, cmd='get', limit=3, offset=2)
+    assert result['total'] == 7
+    assert [r['code'] for r in result['records']] == ['u2', 'u3', 'u4']
+    assert result['summary'][0]['id'] == 7
+    search = [dict(field='type', operator='is', value='ADMIN')]
+    result = post(client, cmd='get', limit=10, offset=0, columns=['code'], search=search,
+                  searchLogic='AND')
+    assert result['total'] == 3
+    assert result['records'] == [dict(id=2, code='u1'), dict(id=4, code='u3'), dict(id=6, code='u5')]
+
+
+def test_save(users, client):
+    changes = [dict(recid=-1, code='new', name='New'), dict(recid=1, name='Renamed')]
+    result = post(client, cmd='save', changes=changes)
+    assert [(u['recid'], u['record']['code'], u['record']['name']) for u in result['updates']] == \
+        [(-1, 'new', 'New'), (1, 'u0', 'Renamed')]
+    with users.app_context():
+        assert session.get(User, 1).name == 'Renamed'
+        assert session.query(User).filter_by(code='new').one().name == 'New'
+    assert post(client, cmd='get', limit=10, offset=0)['total'] == 8
+
+
+def test_save_error(users, client):
+    result = client.post('/async/users', data={'request': '{"cmd": "save", "changes": [{"recid": 2, "code": "u0"}]}'})
+    assert result.get_json()['status'] == 'error'
+    with users.app_context():
+        assert session.get(User, 2).code == 'u1'
+
+
+def test_delete(users, client):
+    post(client, cmd='get', limit=10, offset=0)      # Cached total
+    post(client, cmd='delete', selected=[1, 3, 99, -1])
+    with users.app_context():
+        assert [u.id for u in session.query(User).order_by(User.id)] == [2, 4, 5, 6, 7]
+    assert post(client, cmd='get', limit=10, offset=0)['total'] == 5
@@ -0,0 +1,29 @@
+"""
+Identification
+    Module:     test_bench.py
+    Author:     Victor Puska
+    Written:    Oct 19, 2026
+    Copyright:  (c) 2026 by VICTOR PUSKA.
+    License:    LICENSE_NAME, see LICENSE_FILE for more details.
+
+Description
+    Benchmark applications run apart from the current application.
+"""
+
+from core import bench, loadtest
+from core.jobs import job_queue
+from core.metrics import request_metrics
+from core.throttle import login_throttle
+
+
+def test_isolated(app, tmp_path):
+    path = str(tmp_path / 'bench.db')
+    singletons = [(s, s.app) for s in (job_queue, request_metrics)]
+    store = login_throttle.store
+    report = bench.isolated(path, bench.report, {}, users=20, items=50)
+    assert report['meta']['users'] == 20
+    assert all(s.app is bound for s, bound in singletons) and login_throttle.store is store
+    mix = loadtest.parse_mix('list=1')
+    r = bench.isolated(path, loadtest.drive, mix, '/users', 10, 0, 1, 0.2, 'thread')
+    assert r['requests'] > 0 and r['errors'] == 0
+    assert all(s.app is bound for s, bound in singletons) and login_throttle.store is store
@@ -0,0 +1,70 @@
+"""
+Identification
+    Module:     test_capture.py
+    Author:     Victor Puska
+    Written:    Oct 19, 2026
+    Copyright:  (c) 2026 by VICTOR PUSKA.
+    License:    LICENSE_NAME, see LICENSE_FILE for more details.
+
+Description
+    Recording and replay of grid traffic.
+"""
+
+import json
+import time
+
+import pytest
+
+from core import User, session
+from core.capture import TrafficRecorder, read_capture, replay
+
+
+@pytest.fixture
+def recorded(app, tmp_path):
+    app.config.update(CAPTURE_FILE=str(tmp_path / 'capture.jsonl'), W2GRID_FETCH_BATCH=2)
+    recorder = TrafficRecorder(app)
+    with app.app_context():
+        session.add_all([User(code='u%d' % i, name='User %d' % i) for i in range(5)])
+        session.commit()
+    yield app
+    for handler in recorder.logger.handlers:
+        handler.close()
+    recorder.logger.handlers.clear()
+
+
+def test_record(recorded, client):
+    search = [dict(field='name', operator='contains', value='User')]
+    client.post('/users', data={'request': json.dumps(dict(cmd='get', limit=2, offset=0, search=search))}).close()
+    client.get('/users').close()
+    records = list(read_capture(recorded.config['CAPTURE_FILE']))
+    assert len(records) == 1
+    assert records[0]['cmd'] == 'get'
+    assert records[0]['status'] == 200
+    value = records[0]['request']['search'][0]['value']
+    assert len(value) == 4 and value != 'User'
+
+
+def test_record_streamed_duration(recorded, client, monkeypatch):
+    from core import grid
+
+    def slow_stream(self, q, batch_size, offset=None, limit=None):
+        for row in original(self, q, batch_size, offset, limit):
+            time.sleep(0.05)
+            yield row
+    original = grid.W2GridView.stream
+    monkeypatch.setattr(grid.W2GridView, 'stream', slow_stream)
+    response = client.post('/users', data={'request': json.dumps(dict(cmd='get', limit=4, offset=0))})
+    assert len(response.get_json()['records']) == 4
+    response.close()
+    records = list(read_capture(recorded.config['CAPTURE_FILE']))
+    assert len(records) == 1
+    assert records[0]['duration_ms'] >= 200
+
+
+def test_replay(recorded, client):
+    for offset in (0, 2):
+        client.post('/users', data={'request': json.dumps(dict(cmd='get', limit=2, offset=offset))}).close()
+    results = replay(recorded, read_capture(recorded.config['CAPTURE_FILE']), speed=0, concurrency=2)
+    r = results[('/users', 'get')]
+    assert len(r['recorded']) == len(r['replayed']) == 2
+    assert r['errors'] == 0
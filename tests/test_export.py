@@ -0,0 +1,100 @@
+"""
+Identification
+    Module:     test_export.py
+    Author:     Victor Puska
+    Written:    Oct 19, 2026
+    Copyright:  (c) 2026 by VICTOR PUSKA.
+    License:    LICENSE_NAME, see LICENSE_FILE for more details.
+
+Description
+    Grid view exports.
+"""
+
+import csv
+import datetime
+import io
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import Float, Numeric
+from sqlalchemy.sql import column
+
+from core import User, session
+from core.database import Items
+from core import columnar
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+needs_pyarrow = pytest.mark.skipif(pyarrow is None, reason="Columnar export requires the pyarrow package")
+
+
+@pytest.fixture
+def users(app):
+    with app.app_context():
+        alice = User(code='a1', name='Alice', active=True, created=datetime.datetime(2026, 1, 2, 3, 4, 5))
+        session.add_all([alice, User(code='b2', name=None, active=False), Items(name='x', user=alice)])
+        session.commit()
+    return app
+
+
+def test_export_csv(users, client):
+    r = client.get('/users/export.csv')
+    assert r.status_code == 200
+    rows = list(csv.reader(io.StringIO(r.get_data(as_text=True))))
+    assert rows[0][:3] == ['id', 'code', 'name']
+    assert [row[1] for row in rows[1:]] == ['a1', 'b2']
+
+
+def test_export_unknown_format(client):
+    for fmt in ('columnar', 'xls', 'csv_'):
+        assert client.get('/users/export.%s' % fmt).status_code == 404
+
+
+def check_columnar_table(table):
+    assert table.column_names[:4] == ['id', 'code', 'name', 'email']
+    assert table.schema.field('id').type == pyarrow.int64()
+    assert table.schema.field('active').type == pyarrow.bool_()
+    assert table.schema.field('created').type == pyarrow.timestamp('us')
+    rows = table.to_pylist()
+    assert [(r['id'], r['code'], r['name'], r['active'], r['items']) for r in rows] == \
+        [(1, 'a1', 'Alice', True, 1), (2, 'b2', None, False, 0)]
+    assert rows[0]['created'] == datetime.datetime(2026, 1, 2, 3, 4, 5)
+
+
+@needs_pyarrow
+def test_export_arrow(users, client):
+    app = users
+    app.config['W2GRID_EXPORT_BATCH'] = 1
+    r = client.get('/users/export.arrow')
+    assert r.status_code == 200 and r.mimetype == 'application/vnd.apache.arrow.stream'
+    reader = pyarrow.ipc.open_stream(r.get_data())
+    batches = list(reader)
+    assert [b.num_rows for b in batches] == [1, 1]
+    check_columnar_table(pyarrow.Table.from_batches(batches, reader.schema))
+
+
+@needs_pyarrow
+def test_export_parquet(users, client):
+    r = client.get('/users/export.parquet')
+    assert r.status_code == 200
+    check_columnar_table(pyarrow.parquet.read_table(io.BytesIO(r.get_data())))
+
+
+@needs_pyarrow
+def test_numeric_types():
+    def arrow_type(sqltype):
+        return columnar.arrow_type(SimpleNamespace(expression=column('c', sqltype)))
+
+    assert arrow_type(Numeric(10, 2)) == pyarrow.decimal128(10, 2)
+    assert arrow_type(Numeric()) == pyarrow.decimal128(columnar.DECIMAL_PRECISION, columnar.DECIMAL_SCALE)
+    assert arrow_type(Numeric(10, 2, asdecimal=False)) == pyarrow.float64()
+    assert arrow_type(Float()) == pyarrow.float64()
+    schema = pyarrow.schema([('n', arrow_type(Numeric(10, 2)))])
+    batch, = columnar.record_batches([(Decimal('1.25'),), (None,)], schema, 10)
+    assert batch.column(0).to_pylist() == [Decimal('1.25'), None]
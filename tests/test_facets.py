@@ -0,0 +1,71 @@
+"""
+Identification
+    Module:     test_facets.py
+    Author:     Victor Puska
+    Written:    Oct 19, 2026
+    Copyright:  (c) 2026 by VICTOR PUSKA.
+    License:    LICENSE_NAME, see LICENSE_FILE for more details.
+
+Description
+    Facet counts of related and computed columns.
+"""
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from core import User, session
+from core.database import Items
+from core.grid import W2GridView
+from w2ui.definitions import W2Column
+
+
+class OwnerTypeView:
+    id = W2Column(Items.id, type='int')
+    name = W2Column(Items.name)
+    ownertype = W2Column(User.type, path=Items.user, facet=True)
+
+    __tablename__ = "OwnerTypeFacets"
+
+
+class ItemCountView:
+    id = W2Column(User.id, type='int')
+    code = W2Column(User.code, operator='contains')
+    items = W2Column(Items.id, path=User.items, path_aggregate='count', facet=True)
+
+    __tablename__ = "ItemCountFacets"
+
+
+@pytest.fixture
+def owners(app):
+    with app.app_context():
+        u1, u2, u3 = User(code='a', type='ADMIN'), User(code='b', type='User'), User(code='c', type='User')
+        session.add_all([u1, u2, u3, Items(name='1', user=u1), Items(name='2', user=u2), Items(name='3', user=u2),
+                         Items(name='4', user=u3), Items(name='5')])
+        session.commit()
+    return app
+
+
+def facets(app, view, w2req=None):
+    with app.test_request_context():
+        return W2GridView(view=view).facets(w2req or {}).get_json()['facets']
+
+
+def test_related_facet(owners):
+    counts = facets(owners, OwnerTypeView)['ownertype']
+    assert counts[0] == dict(value='User', count=3)
+    assert sorted(counts[1:], key=str) == [dict(value='ADMIN', count=1), dict(value=None, count=1)]
+
+
+def test_computed_facet(owners):
+    assert facets(owners, ItemCountView) == dict(items=[dict(value=1, count=2), dict(value=2, count=1)])
+    search = dict(search=[dict(field='code', operator='contains', value='b')], searchLogic='AND')
+    assert facets(owners, ItemCountView, search) == dict(items=[dict(value=2, count=1)])
+
+
+def test_grouping_sets(owners):
+    with owners.test_request_context():
+        view = W2GridView(view=OwnerTypeView)
+        statement, _ = view.facet_statement(view.query, 'postgresql')
+        sql = str(statement.compile(dialect=postgresql.dialect()))
+    assert 'GROUPING SETS("user".type)' in sql
+    assert 'LEFT OUTER JOIN "user"' in sql
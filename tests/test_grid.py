@@ -0,0 +1,139 @@
+"""
+Identification
+    Module:     test_grid.py
+    Author:     Victor Puska
+    Written:    Oct 19, 2026
+    Copyright:  (c) 2026 by VICTOR PUSKA.
+    License:    LICENSE_NAME, see LICENSE_FILE for more details.
+
+Description
+    W2GridView requests: lists, summaries, saves and deletes.
+"""
+
+import json
+
+import pytest
+
+from core import User, session
+from core.database import Items
+from core.grid import W2GridView
+from w2ui.definitions import W2Column
+
+
+@pytest.fixture
+def users(app):
+    with app.app_context():
+        session.add_all([User(code='u%d' % i, name='User %d' % i, type='ADMIN' if i % 2 else 'SUPER',
+                              active=i % 3 == 0) for i in range(7)])
+        session.commit()
+    return app
+
+
+def post(client, url='/users', **w2req):
+    response = client.post(url, data={'request': json.dumps(w2req)})
+    assert response.status_code == 200
+    result = response.get_json()
+    assert result['status'] == 'success', result
+    return result
+
+
+def test_list(users, client):
+    result = post(client, cmd='get', limit=3, offset=2)
+    assert result['total'] == 7
+    assert [r['code'] for r in result['records']] == ['u2', 'u3', 'u4']
+    assert result['records'][0]['id'] == 3
+
+
+def test_summary(users, client):
+    result = post(client, cmd='get', limit=2, offset=0)
+    assert result['summary'] == [dict(recid='S-1', w2ui=dict(summary=True), id=7)]
+    search = [dict(field='type', operator='is', value='ADMIN')]
+    result = post(client, cmd='get', limit=2, offset=0, search=search, searchLogic='AND')
+    assert result['total'] == 3
+    assert result['summary'][0]['id'] == 3
+
+
+def test_summary_cache_invalidated(users, client):
+    users.config['W2GRID_CACHE_TTL'] = 60
+    assert post(client, cmd='get', limit=2, offset=0)['summary'][0]['id'] == 7
+    post(client, cmd='delete', selected=[1, 2])
+    assert post(client, cmd='get', limit=2, offset=0)['summary'][0]['id'] == 5
+    post(client, cmd='save', changes=[dict(recid=-1, code='new')])
+    result = post(client, cmd='get', limit=2, offset=0)
+    assert result['total'] == result['summary'][0]['id'] == 6
+
+
+def test_facets(users, client):
+    facets = post(client, cmd='facets')['facets']
+    assert facets['type'] == [dict(value='SUPER', count=4), dict(value='ADMIN', count=3)]
+    assert facets['active'] == [dict(value=False, count=4), dict(value=True, count=3)]
+    search = [dict(field='code', operator='contains', value='u1')]
+    facets = post(client, cmd='facets', search=search, searchLogic='AND')['facets']
+    assert facets == dict(type=[dict(value='ADMIN', count=1)], active=[dict(value=False, count=1)])
+
+
+def test_save(users, client):
+    result = post(client, cmd='save', changes=[dict(recid=1, name='Renamed'), dict(recid=-1, code='new')])
+    assert [u['recid'] for u in result['updates']] == [1, -1]
+    assert result['updates'][0]['record']['name'] == 'Renamed'
+    assert result['updates'][1]['record']['id'] == 8
+    assert result['updates'][1]['record']['type'] == 'User'
+
+
+def test_related_columns(users, client):
+    with users.app_context():
+        session.add_all([Items(name='a', userid=2), Items(name='b', userid=2), Items(name='c', userid=3)])
+        session.commit()
+    result = post(client, '/items', cmd='get', limit=10, offset=0)
+    assert [(r['name'], r['owner']) for r in result['records']] == [('a', 'u1'), ('b', 'u1'), ('c', 'u2')]
+    search = [dict(field='owner', operator='contains', value='u2')]
+    result = post(client, '/items', cmd='get', limit=10, offset=0, search=search, searchLogic='AND')
+    assert [r['name'] for r in result['records']] == ['c']
+
+
+class OwnedItemsView:
+    id = W2Column(Items.id, type='int', aggregate='count')
+    name = W2Column(Items.name, operator='contains')
+    owner = W2Column(User.code, path=Items.user, operator='contains')
+    ownername = W2Column(User.name, path=Items.user, aggregate='max', facet=True)
+
+    __tablename__ = "OwnedItems"
+
+
+def test_projection(users, client):
+    with users.app_context():
+        session.add_all([Items(name='a', userid=2), Items(name='b', userid=4), Items(name='c', userid=3)])
+        session.commit()
+    search = [dict(field='owner', operator='contains', value=code) for code in ('u1', 'u3')]
+    w2req = dict(cmd='get', limit=10, offset=0, columns=['name', 'nope'], search=search, searchLogic='OR')
+    with users.test_request_context():
+        view = W2GridView(view=OwnedItemsView)
+        result = view.list(w2req).get_json()
+        assert [c['name'] for c in view.query.column_descriptions] == ['id', 'name']
+        assert view.fields == ['id', 'name']
+        sql = str(view.query)
+        assert sql.startswith('SELECT items.id AS items_id, items.name AS items_name \nFROM')
+        assert sql.count('JOIN') == 1
+        assert W2GridView(view=OwnedItemsView).facets(w2req).get_json()['facets'] == \
+            dict(ownername=[dict(value='User 1', count=1), dict(value='User 3', count=1)])
+    assert result['total'] == 2
+    assert result['summary'][0]['ownername'] == 'User 3'
+    assert result['records'] == [dict(id=1, name='a'), dict(id=2, name='b')]
+    # Summarized without being searched
+    with users.test_request_context():
+        result = W2GridView(view=OwnedItemsView).list(dict(cmd='get', limit=10, offset=0, columns=['name'])).get_json()
+    assert result['total'] == 3 and result['summary'][0]['ownername'] == 'User 3'
+
+
+def test_streamed_pages(users, client):
+    users.config['W2GRID_FETCH_BATCH'] = 2
+    small = post(client, cmd='get', limit=2, offset=1)
+    response = client.post('/users', data={'request': json.dumps(dict(cmd='get', limit=5, offset=1))})
+    assert response.is_streamed
+    streamed = response.get_json()
+    assert streamed['total'] == 7
+    assert streamed['summary'] == small['summary']
+    assert [r['code'] for r in streamed['records']] == ['u1', 'u2', 'u3', 'u4', 'u5']
+    assert streamed['records'][:2] == small['records']
+    assert [r['id'] for r in post(client, cmd='get', offset=4)['records']] == [5, 6, 7]
+    assert post(client, cmd='get', limit=5, offset=10)['records'] == []
@@ -0,0 +1,73 @@
+"""
+Identification
+    Module:     test_import.py
+    Author:     Victor Puska
+    Written:    Oct 19, 2026
+    Copyright:  (c) 2026 by VICTOR PUSKA.
+    License:    LICENSE_NAME, see LICENSE_FILE for more details.
+
+Description
+    Bulk loads of grid views and the import command.
+"""
+
+from core import User, session
+from core.cli import core_cli_group
+from core.grid import grid_view
+
+
+def load(app, records, **kwargs):
+    with app.app_context():
+        return list(grid_view('edit').bulk_load(records, **kwargs))
+
+
+def users(app):
+    with app.app_context():
+        return [(u.id, u.code, u.name, u.type, u.active) for u in session.query(User).order_by(User.id)]
+
+
+def test_bulk_load_defaults(app):
+    assert load(app, [dict(code='a', name='A'), dict(code='b', type='ADMIN'), dict(code='c', active=False)]) == [3]
+    assert users(app) == [(1, 'a', 'A', 'User', True), (2, 'b', None, 'ADMIN', True), (3, 'c', None, 'User', False)]
+
+
+def test_bulk_load_batches(app):
+    assert load(app, [dict(code='u%d' % i) for i in range(7)], batch_size=3) == [3, 3, 1]
+    assert len(users(app)) == 7
+
+
+def test_bulk_load_duplicate_keys(app):
+    records = [dict(id=1, code='a', name='first'), dict(id=2, code='b'), dict(id=1, code='a', name='last')]
+    assert load(app, records) == [2]
+    assert users(app) == [(1, 'a', 'last', 'User', True), (2, 'b', None, 'User', True)]
+
+
+def test_bulk_load_upsert(app):
+    load(app, [dict(id=1, code='a', name='A', type='ADMIN'), dict(id=2, code='b', name='B')])
+    load(app, [dict(id=1, code='a', name='Renamed'), dict(id=3, code='c'), dict(id=1, code='a', type='SUPER')],
+         upsert=True)
+    assert users(app) == [(1, 'a', 'A', 'SUPER', True), (2, 'b', 'B', 'User', True), (3, 'c', None, 'User', True)]
+
+
+def import_csv(app, tmp_path, text, *args):
+    path = tmp_path / 'import.csv'
+    path.write_text(text)
+    return app.test_cli_runner().invoke(core_cli_group, ['import', 'Users', str(path)] + list(args))
+
+
+def test_import_blank_cells(app, tmp_path):
+    result = import_csv(app, tmp_path, "code,User Name,type,active\na,Alice,,\nb,,ADMIN,false\n")
+    assert result.exit_code == 0, result.output
+    assert users(app) == [(1, 'a', 'Alice', 'User', True), (2, 'b', None, 'ADMIN', False)]
+
+
+def test_import_bad_value(app, tmp_path):
+    result = import_csv(app, tmp_path, "code,id\na,1\nb,2\nc,x\n")
+    assert result.exit_code != 0
+    assert "Line 4: bad value for id: 'x'" in result.output
+
+
+def test_import_failed_batch(app, tmp_path):
+    result = import_csv(app, tmp_path, "code,name\na,A\nb,B\na,C\nd,D\n", '--batch-size', '2')
+    assert result.exit_code != 0
+    assert "Lines 4 to 5 failed (2 rows were imported)" in result.output
+    assert [u[1] for u in users(app)] == ['a', 'b']
@@ -0,0 +1,132 @@
+"""
+Identification
+    Module:     test_jobs.py
+    Author:     Victor Puska
+    Written:    Oct 19, 2026
+    Copyright:  (c) 2026 by VICTOR PUSKA.
+    License:    LICENSE_NAME, see LICENSE_FILE for more details.
+
+Description
+    The background job queue and the grid's jobs.
+"""
+
+import json
+import os
+import time
+
+import pytest
+
+from core import User, session
+from core.jobs import job_queue
+
+
+@pytest.fixture
+def users(app):
+    with app.app_context():
+        session.add_all([User(code='u%02d' % i, type='ADMIN' if i % 2 else 'User') for i in range(20)])
+        session.commit()
+    return app
+
+
+def wait(client, job):
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        state = client.get('/jobs/%s' % job['id']).get_json()['job']
+        if state['status'] not in ('queued', 'running'):
+            return state
+        time.sleep(0.05)
+    raise AssertionError("Job did not finish: %s" % state)
+
+
+def submit(client, **w2req):
+    result = client.post('/users', data={'request': json.dumps(dict(cmd='job', **w2req))}).get_json()
+    assert result['status'] == 'success', result
+    return result['job']
+
+
+def test_delete_job(users, client):
+    job = submit(client, job='delete', search=[dict(field='type', operator='is', value='ADMIN')], searchLogic='AND')
+    state = wait(client, job)
+    assert state['status'] == 'done'
+    assert state['done'] == 10
+    with users.app_context():
+        assert session.query(User).count() == 10
+        assert session.query(User).filter(User.type == 'ADMIN').count() == 0
+
+
+def test_delete_all_job(users, client):
+    request = dict(cmd='job', job='delete', search=[], searchLogic='AND')
+    for extra in (dict(), dict(confirm=True), dict(confirm=True, total=19), dict(total=20)):
+        result = client.post('/users', data={'request': json.dumps(dict(request, **extra))}).get_json()
+        assert result['status'] == 'error' and result['total'] == 20
+    state = wait(client, submit(client, job='delete', confirm=True, total=20))
+    assert state['status'] == 'done'
+    with users.app_context():
+        assert session.query(User).count() == 0
+
+
+def test_expire(users, client):
+    job = submit(client, job='xlsx')
+    state = wait(client, job)
+    kept = job_queue.create('xlsx')   # Queued jobs never expire
+    with users.app_context():
+        assert job_queue.expire() == 0
+        assert job_queue.expire(hours=0) == 0     # Finished in the current second
+        old = job_queue.job(job['id'])
+        old.update(finished='2000-01-01T00:00:00')
+        open(old.path('.cancel'), 'w').close()
+        assert job_queue.expire() == 1
+        assert job_queue.job(job['id']) is None
+        assert [s['id'] for s in job_queue.jobs()] == [kept.id]
+        assert not any(name.startswith(job['id']) for name in os.listdir(job_queue.directory))
+
+
+def test_unknown_job(users, client):
+    result = client.post('/users', data={'request': json.dumps(dict(cmd='job', job='drop'))}).get_json()
+    assert result['status'] == 'error'
+
+
+def test_xlsx_job(users, client, tmp_path):
+    openpyxl = pytest.importorskip('openpyxl')
+    state = wait(client, submit(client, job='xlsx'))
+    assert state['status'] == 'done', state
+    response = client.get('/jobs/%s/result' % state['id'])
+    assert response.status_code == 200
+    path = tmp_path / 'export.xlsx'
+    with open(path, 'wb') as f:
+        f.write(response.data)
+    rows = list(openpyxl.load_workbook(path, read_only=True).active.values)
+    assert len(rows) == 21
+    assert rows[1][1] == 'u00'
+
+
+def test_run_states(users):
+    calls = []
+
+    @job_queue.task('test')
+    def task(job, fail):
+        calls.append(job.id)
+        if fail:
+            raise ValueError("failed on purpose")
+        job.progress(1, 1)
+    try:
+        job = job_queue.create('test', fail=False)
+        job_queue.run(job)
+        assert job.load()['status'] == 'done'
+        job = job_queue.create('test', fail=True)
+        job_queue.run(job)
+        assert job.load()['status'] == 'failed'
+        assert job.load()['message'] == "failed on purpose"
+        job = job_queue.create('test', fail=False)
+        job.cancel()
+        assert job.load()['status'] == 'cancelled'
+        job_queue.run(job)
+        assert len(calls) == 2
+    finally:
+        del job_queue.tasks['test']
+
+
+def test_job_ids(users, client):
+    assert client.get('/jobs/0123').status_code == 404
+    assert client.get('/jobs/..%2F..%2Fconfig').status_code == 404
+    assert client.get('/jobs/%s' % ('0' * 32)).status_code == 404
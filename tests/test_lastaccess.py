@@ -0,0 +1,59 @@
+"""
+Identification
+    Module:     test_lastaccess.py
+    Author:     Victor Puska
+    Written:    Oct 19, 2026
+    Copyright:  (c) 2026 by VICTOR PUSKA.
+    License:    LICENSE_NAME, see LICENSE_FILE for more details.
+
+Description
+    Write-behind of users' last access times.
+"""
+
+import datetime
+
+from core import User, session
+from core.lastaccess import AccessTracker
+
+
+def tracker(app):
+    t = AccessTracker()
+    t.app = app
+    t.interval = 3600       # Flushed by the tests only
+    return t
+
+
+def lastaccess(app):
+    with app.app_context():
+        session.expire_all()
+        return [u.lastaccess for u in session.query(User).order_by(User.id)]
+
+
+def test_flush(app):
+    with app.app_context():
+        session.add_all([User(code='a'), User(code='b'), User(code='c')])
+        session.commit()
+    t = tracker(app)
+    t1 = datetime.datetime(2026, 10, 19, 9, 0)
+    t2 = datetime.datetime(2026, 10, 19, 10, 0)
+    t.touch(1, t1)
+    t.touch(2, t1)
+    t.touch(1, t2)
+    assert t.flush() == 2
+    assert lastaccess(app) == [t2, t1, None]
+    assert t.flush() == 0
+
+
+def test_flush_keeps_later_times(app):
+    # Two workers flushing in the wrong order: the earlier time must not replace the later one
+    with app.app_context():
+        session.add(User(code='a'))
+        session.commit()
+    early, late = tracker(app), tracker(app)
+    t1 = datetime.datetime(2026, 10, 19, 9, 0)
+    t2 = datetime.datetime(2026, 10, 19, 10, 0)
+    early.touch(1, t1)
+    late.touch(1, t2)
+    late.flush()
+    early.flush()
+    assert lastaccess(app) == [t2]
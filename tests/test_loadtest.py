@@ -0,0 +1,59 @@
+"""
+Identification
+    Module:     test_loadtest.py
+    Author:     Victor Puska
+    Written:    Oct 19, 2026
+    Copyright:  (c) 2026 by VICTOR PUSKA.
+    License:    LICENSE_NAME, see LICENSE_FILE for more details.
+
+Description
+    The in-process load driver.
+"""
+
+import pytest
+from sqlalchemy import event
+
+from core import db
+from core.loadtest import LoadDriver, parse_mix, DEFAULT_MIX
+from core.seed import Seeder
+
+
+@pytest.fixture
+def seeded(app):
+    with app.app_context():
+        seeder = Seeder(seed=1)
+        seeder.seed_items(200, seeder.seed_users(50))
+    return app
+
+
+def test_driver_fields(seeded):
+    driver = LoadDriver(seeded, parse_mix(DEFAULT_MIX), url='/items')
+    assert driver.text_fields == ['name']
+    assert driver.required_fields == []
+    assert sorted(search[0]['field'] for search in driver.searches[1:]) == ['name', 'owner']
+    driver = LoadDriver(seeded, parse_mix(DEFAULT_MIX), url='/users')
+    assert driver.text_fields == ['name', 'email']
+    assert driver.required_fields == ['code']
+
+
+@pytest.mark.parametrize('url', ['/users', '/items'])
+def test_driver_run(seeded, url):
+    r = LoadDriver(seeded, parse_mix(DEFAULT_MIX), url=url, page_size=20).run(concurrency=2, duration=0.5)
+    assert r['requests'] > 0
+    assert r['errors'] == 0
+
+
+def test_driver_listener_removed(seeded):
+    driver = LoadDriver(seeded, parse_mix('list=1'), url='/users', page_size=20)
+    with seeded.app_context():
+        engine = db.engine
+    assert not event.contains(engine, "before_cursor_execute", driver._count_statement)
+    r = driver.run(concurrency=1, duration=0.2)
+    assert r['statements_per_request'] > 0
+    assert not event.contains(engine, "before_cursor_execute", driver._count_statement)
+
+
+def test_driver_unknown_url(seeded):
+    for url in ('/nope', '/users/export.csv'):
+        with pytest.raises(ValueError):
+            LoadDriver(seeded, parse_mix(DEFAULT_MIX), url=url)
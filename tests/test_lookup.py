@@ -0,0 +1,62 @@
+"""
+Identification
+    Module:     test_lookup.py
+    Author:     Victor Puska
+    Written:    Oct 19, 2026
+    Copyright:  (c) 2026 by VICTOR PUSKA.
+    License:    LICENSE_NAME, see LICENSE_FILE for more details.
+
+Description
+    Remote lookups of combo and list editors.
+"""
+
+import json
+from urllib.parse import quote
+
+from core import User, session
+
+
+def add_users(app, n):
+    with app.app_context():
+        session.add_all([User(code='u%02d' % i, type='USER' if i % 2 else 'ADMIN') for i in range(n)])
+        session.commit()
+
+
+def test_lookup_search(app, client):
+    add_users(app, 5)
+    records = client.get('/items/lookup/userid?search=u0').get_json()['records']
+    assert [r['text'] for r in records] == ['u00', 'u01', 'u02', 'u03', 'u04']
+    assert records[0]['id'] == 1
+    records = client.get('/users/lookup/type').get_json()['records']
+    assert records == [dict(id='ADMIN', text='ADMIN'), dict(id='USER', text='USER')]
+
+
+def test_lookup_limit(app, client):
+    app.config['W2GRID_LOOKUP_LIMIT'] = 3
+    add_users(app, 10)
+    for max_, expected in ((None, 3), (2, 2), (50, 3), (0, 1), (-1, 1)):
+        url = '/items/lookup/userid' + ('' if max_ is None else '?max=%d' % max_)
+        assert len(client.get(url).get_json()['records']) == expected
+
+
+def test_lookup_request_param(app, client):
+    app.config['W2GRID_LOOKUP_LIMIT'] = 3
+    add_users(app, 10)
+
+    def lookup(**w2req):
+        url = '/items/lookup/userid?request=' + quote(json.dumps(w2req))
+        return [r['text'] for r in client.get(url).get_json()['records']]
+
+    assert lookup(search='u0', max=2) == ['u00', 'u01']
+    assert lookup(search='u0', max=50) == ['u00', 'u01', 'u02']
+    assert lookup(search='u05') == ['u05']
+    assert lookup(cmd='get', search=None) == ['u00', 'u01', 'u02']
+    url = '/async/items/lookup/userid?request=' + quote(json.dumps(dict(search='u0', max=2)))
+    assert [r['text'] for r in client.get(url).get_json()['records']] == ['u00', 'u01']
+    assert client.get('/items/lookup/userid?request=%5B').status_code == 400
+    assert client.get('/items/lookup/userid?request=%5B%5D').status_code == 400
+
+
+def test_lookup_unknown_field(client):
+    assert client.get('/items/lookup/name').status_code == 404
+    assert client.get('/items/lookup/nope').status_code == 404
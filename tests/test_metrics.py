@@ -0,0 +1,125 @@
+"""
+Identification
+    Module:     test_metrics.py
+    Author:     Victor Puska
+    Written:    Oct 19, 2026
+    Copyright:  (c) 2026 by VICTOR PUSKA.
+    License:    LICENSE_NAME, see LICENSE_FILE for more details.
+
+Description
+    Request metrics and their exposition.
+"""
+
+import json
+import os
+import threading
+
+import pytest
+from flask import Flask, g, abort
+
+from core.metrics import RequestMetrics, BUCKETS, merge, dumps, exposition
+
+
+@pytest.fixture
+def metered(tmp_path):
+    app = Flask(__name__)
+    app.config['METRICS_DIR'] = str(tmp_path / 'metrics')
+    app.config['METRICS_INTERVAL'] = 3600
+
+    @app.route('/page/<cmd>')
+    def page(cmd):
+        g.grid_cmd = cmd
+        return "x" * 10
+
+    @app.route('/fail')
+    def fail():
+        abort(409)
+
+    metrics = RequestMetrics()
+    metrics.init_app(app)
+    yield app, metrics
+    metrics._stop.set()
+
+
+def test_counts(metered):
+    app, metrics = metered
+    client = app.test_client()
+    for url in ('/page/get', '/page/get', '/page/save', '/fail', '/nope'):
+        client.get(url)
+    counts = metrics.snapshot()
+    latency = counts['latency'][('page', 'get')]
+    assert sum(latency[:len(BUCKETS) + 1]) == 2
+    assert counts['sizes'][('page', 'get')] == [2, 20]
+    assert counts['errors'] == {('fail', '', 409): 1, ('unmatched', '', 404): 1}
+    assert counts['inflight'] == {'page': 0, 'fail': 0, 'unmatched': 0}
+
+
+def test_exposition(metered):
+    app, metrics = metered
+    client = app.test_client()
+    client.get('/page/get')
+    text = client.get('/metrics').get_data(as_text=True)
+    assert 'core_request_duration_seconds_count{endpoint="page",cmd="get"} 1' in text
+    assert 'core_request_duration_seconds_bucket{endpoint="page",cmd="get",le="+Inf"} 1' in text
+    assert 'core_response_size_bytes_sum{endpoint="page",cmd="get"} 10' in text
+    assert 'core_requests_in_flight{endpoint="metrics"} 1' in text
+
+
+def test_label_escaping():
+    counts = merge([dict(latency={('a"b', 'c\\nd'): [0] * len(BUCKETS) + [1, 0.5]}, sizes={}, errors={},
+                         inflight={})])
+    assert 'core_request_duration_seconds_count{endpoint="a\\"b",cmd="c\\\\nd"} 1' in exposition(counts)
+
+
+def test_grid_commands(client):
+    # Commands other than the grid's own are counted together, whatever the client sends
+    for cmd in ('get', 'a\tb', 'x' * 100, ['list']):
+        client.post('/users', data={'request': json.dumps(dict(cmd=cmd, limit=10, offset=0))})
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    text = response.get_data(as_text=True)
+    assert 'cmd="get"' in text
+    assert 'cmd="other"' in text
+    assert 'a\tb' not in text and 'x' * 100 not in text
+
+
+def test_thread_shards_are_retired(metered):
+    app, metrics = metered
+    client = app.test_client()
+    threads = [threading.Thread(target=client.get, args=('/page/get',)) for _ in range(50)]
+    for t in threads:
+        t.start()
+        t.join()
+    assert len(metrics._shards) <= 1
+    latency = metrics.snapshot()['latency'][('page', 'get')]
+    assert sum(latency[:len(BUCKETS) + 1]) == 50
+
+
+def test_collect_workers(metered):
+    app, metrics = metered
+    app.test_client().get('/page/get')
+    directory = app.config['METRICS_DIR']
+    other = dict(latency={('page', 'get'): [1] + [0] * len(BUCKETS) + [0.001]}, sizes={('page', 'get'): [1, 10]},
+                 errors={('page', 'get', 500): 2}, inflight={'page': 3})
+    exited = 2 ** 22 + 1    # Above Linux's pid_max, no such process
+    with open(os.path.join(directory, 'metrics-%d.json' % exited), 'w') as f:
+        f.write(dumps(other))
+    with open(os.path.join(directory, 'metrics-%d.json' % os.getppid()), 'w') as f:
+        f.write(dumps(other))
+    with open(os.path.join(directory, 'metrics-1.json'), 'w') as f:
+        f.write('{"latency": {"page\\tget\\tx": [1]}}')
+    counts = metrics.collect()
+    latency = counts['latency'][('page', 'get')]
+    assert sum(latency[:len(BUCKETS) + 1]) == 3
+    assert counts['sizes'][('page', 'get')] == [3, 30]
+    assert counts['errors'][('page', 'get', 500)] == 4
+    assert counts['inflight']['page'] == 3      # Only the running worker's requests are in flight
+
+
+def test_publish(metered):
+    app, metrics = metered
+    app.test_client().get('/page/get')
+    metrics.publish()
+    path = os.path.join(app.config['METRICS_DIR'], 'metrics-%d.json' % os.getpid())
+    assert os.path.exists(path)
+    assert os.listdir(app.config['METRICS_DIR']) == [os.path.basename(path)]
@@ -0,0 +1,91 @@
+"""
+Identification
+    Module:     test_passwords.py
+    Author:     Victor Puska
+    Written:    Oct 19, 2026
+    Copyright:  (c) 2026 by VICTOR PUSKA.
+    License:    LICENSE_NAME, see LICENSE_FILE for more details.
+
+Description
+    Password hashing on the process pool and sign in.
+"""
+
+import threading
+import time
+
+import pytest
+from flask import Flask
+from werkzeug.security import generate_password_hash
+
+from core import User, session
+from core.passwords import PasswordHasher, HasherBusy, hasher
+
+
+def add_user(app, pwhash):
+    with app.app_context():
+        user = User(code='admin', name='Admin')
+        user.password = pwhash
+        session.add(user)
+        session.commit()
+
+
+def stored_hash(app):
+    with app.app_context():
+        session.expire_all()
+        return session.get(User, 1).password
+
+
+def test_hash_and_verify(make_app):
+    make_app(PASSWORD_METHOD='pbkdf2:sha256:1000')
+    assert hasher.method == 'pbkdf2:sha256:1000'
+    pwhash = hasher.hash('secret')
+    assert pwhash.startswith('pbkdf2:sha256:1000$')
+    assert hasher.verify(pwhash, 'secret')
+    assert not hasher.verify(pwhash, 'guess')
+    assert not hasher.needs_rehash(pwhash)
+    assert hasher.needs_rehash(generate_password_hash('secret', 'pbkdf2:sha256:2000'))
+    assert hasher.needs_rehash(generate_password_hash('secret', 'scrypt'))
+    assert not hasher.needs_rehash(None)
+
+
+def test_rehash_at_login(make_app):
+    app = make_app(PASSWORD_METHOD='pbkdf2:sha256:1000')
+    old = generate_password_hash('secret', 'pbkdf2:sha256:2000')
+    add_user(app, old)
+    client = app.test_client()
+    response = client.post('/login', data=dict(username='admin', password='guess'))
+    assert response.location.endswith('/login')
+    assert stored_hash(app) == old
+    response = client.post('/login', data=dict(username='admin', password='secret'))
+    assert response.location.endswith('/')
+    assert stored_hash(app).startswith('pbkdf2:sha256:1000$')
+    assert hasher.verify(stored_hash(app), 'secret')
+
+
+@pytest.fixture
+def pooled():
+    app = Flask(__name__)
+    app.config.update(PASSWORD_METHOD='pbkdf2:sha256:1000', PASSWORD_PROCESSES=1, PASSWORD_QUEUE=0,
+                      PASSWORD_QUEUE_TIMEOUT=0.05)
+    pooled = PasswordHasher()
+    pooled.init_app(app)
+    yield pooled
+    if pooled._pool is not None:
+        pooled._pool.shutdown()
+
+
+def test_pool(pooled):
+    pwhash = pooled.hash('secret')
+    assert pooled.verify(pwhash, 'secret')
+    assert pooled._pool is not None
+
+
+def test_busy(pooled):
+    pooled.verify(pooled.hash('secret'), 'secret')       # Start the worker process
+    busy = threading.Thread(target=pooled._run, args=(time.sleep, 1.0))
+    busy.start()
+    time.sleep(0.2)
+    with pytest.raises(HasherBusy):
+        pooled.hash('secret')
+    busy.join()
+    assert pooled.hash('secret')                        # The slot is released when the work is done
@@ -0,0 +1,87 @@
+"""
+Identification
+    Module:     test_routing.py
+    Author:     Victor Puska
+    Written:    Oct 19, 2026
+    Copyright:  (c) 2026 by VICTOR PUSKA.
+    License:    LICENSE_NAME, see LICENSE_FILE for more details.
+
+Description
+    Routing of grid reads to a read replica.
+"""
+
+import json
+import shutil
+import sqlite3
+import time
+
+import pytest
+
+from core import User, db, session
+from core.routing import on_replica
+
+
+@pytest.fixture
+def replicated(make_app, tmp_path):
+    """An application whose replica is a copy of the primary with every name changed to 'Replica'."""
+    app = make_app(SQLALCHEMY_BINDS={'replica': 'sqlite:///%s' % (tmp_path / 'replica.db')},
+                   REPLICA_STICKY_SECONDS=0.5)
+    with app.app_context():
+        session.add_all([User(code='u%d' % i, name='Primary', type='ADMIN') for i in range(3)])
+        session.commit()
+        db.engine.dispose()
+    shutil.copy(tmp_path / 'core.db', tmp_path / 'replica.db')
+    with sqlite3.connect(tmp_path / 'replica.db') as connection:
+        connection.execute("UPDATE user SET name = 'Replica'")
+    return app
+
+
+def names(client, url='/users'):
+    result = client.post(url, data={'request': json.dumps(dict(cmd='get', limit=10, offset=0))}).get_json()
+    return [r['name'] for r in result['records']]
+
+
+def test_reads(replicated):
+    client = replicated.test_client()
+    assert names(client) == ['Replica'] * 3
+    assert client.get('/users/export.csv').get_data(as_text=True).splitlines()[1].split(',')[2] == 'Replica'
+    with replicated.app_context():
+        assert session.query(User.name).first()[0] == 'Primary'          # Unmarked reads use the primary
+        assert on_replica(session.query(User.name)).first()[0] == 'Replica'
+
+
+def test_read_your_writes(replicated):
+    client = replicated.test_client()
+    save = dict(cmd='save', changes=[dict(recid=1, name='Saved')])
+    result = client.post('/users', data={'request': json.dumps(save)}).get_json()
+    assert result['updates'][0]['record']['name'] == 'Saved'             # Read back from the primary
+    assert names(client) == ['Saved', 'Primary', 'Primary']             # The writer sticks to the primary
+    assert names(replicated.test_client()) == ['Replica'] * 3            # Other users do not
+    time.sleep(0.6)
+    assert names(client) == ['Replica'] * 3
+
+
+def test_async_views(replicated):
+    client = replicated.test_client()
+    assert names(client, '/async/users') == ['Primary'] * 3             # Async views read the primary
+    save = dict(cmd='save', changes=[dict(recid=1, name='Saved')])
+    assert client.post('/async/users', data={'request': json.dumps(save)}).get_json()['status'] == 'success'
+    assert names(client) == ['Saved', 'Primary', 'Primary']             # Async writes stick too
+    assert names(replicated.test_client()) == ['Replica'] * 3
+
+
+def test_writes_in_transaction(replicated):
+    with replicated.app_context():
+        user = session.get(User, 1)
+        user.name = 'Changed'
+        session.flush()
+        assert on_replica(session.query(User.name).filter(User.id == 1)).scalar() == 'Changed'
+        session.rollback()
+        assert on_replica(session.query(User.name).filter(User.id == 1)).scalar() == 'Replica'
+
+
+def test_without_replica(client, app):
+    with app.app_context():
+        session.add(User(code='a', name='Primary'))
+        session.commit()
+    assert names(client) == ['Primary']
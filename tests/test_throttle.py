@@ -0,0 +1,90 @@
+"""
+Identification
+    Module:     test_throttle.py
+    Author:     Victor Puska
+    Written:    Oct 19, 2026
+    Copyright:  (c) 2026 by VICTOR PUSKA.
+    License:    LICENSE_NAME, see LICENSE_FILE for more details.
+
+Description
+    Throttling of sign in attempts.
+"""
+
+import pytest
+from flask import request
+
+from core.throttle import MemoryStore, FileStore, LoginThrottle, login_throttle
+
+
+@pytest.fixture(params=['memory', 'file'])
+def store(request, tmp_path):
+    return MemoryStore() if request.param == 'memory' else FileStore(str(tmp_path / 'throttle.db'))
+
+
+def test_bucket(store):
+    rate, burst = 1.0, 3
+    assert [store.take('k', rate, burst, 100.0) for _ in range(4)] == [True, True, True, False]
+    assert store.take('other', rate, burst, 100.0)
+    assert not store.take('k', rate, burst, 100.5)
+    assert store.take('k', rate, burst, 101.0)          # One token refilled per second
+    assert not store.take('k', rate, burst, 101.0)
+    assert [store.take('k', rate, burst, 200.0) for _ in range(4)] == [True, True, True, False]
+
+
+def test_file_store_shared(tmp_path):
+    first, second = FileStore(str(tmp_path / 'throttle.db')), FileStore(str(tmp_path / 'throttle.db'))
+    assert first.take('k', 1.0, 2, 100.0)
+    assert second.take('k', 1.0, 2, 100.0)
+    assert not first.take('k', 1.0, 2, 100.0)
+
+
+def test_memory_store_size():
+    store = MemoryStore(maxsize=2)
+    for key in ('a', 'b', 'c'):
+        store.take(key, 1.0, 1, 100.0)
+    assert list(store._buckets) == ['b', 'c']
+
+
+def test_allow():
+    throttle = LoginThrottle()
+    throttle.burst = throttle.address_burst = 2
+    assert throttle.allow('Admin', '10.0.0.1')
+    assert throttle.allow('admin', '10.0.0.2')
+    assert not throttle.allow('ADMIN', '10.0.0.3')      # Usernames are throttled whatever their case
+    assert throttle.allow('other', '10.0.0.3')
+    assert not throttle.allow('third', '10.0.0.3')      # and addresses whatever the username
+    assert throttle.counters() == dict(login_allowed=3, login_throttled_user=1, login_throttled_address=1)
+
+
+def test_address_limits():
+    throttle = LoginThrottle()
+    throttle.burst, throttle.address_burst = 1, 3
+    assert [throttle.allow(name, '10.0.0.1') for name in ('a', 'b', 'c', 'd')] == [True, True, True, False]
+    assert not throttle.allow('a', '10.0.0.2')
+    assert throttle.counters() == dict(login_allowed=3, login_throttled_user=1, login_throttled_address=1)
+
+
+def test_client_address(app):
+    throttle = LoginThrottle()
+    headers = {'X-Forwarded-For': '1.1.1.1, 10.0.0.1, 10.0.0.2'}
+    for proxies, expected in ((0, '127.0.0.9'), (1, '10.0.0.2'), (2, '10.0.0.1'), (3, '1.1.1.1'), (4, '127.0.0.9')):
+        throttle.trusted_proxies = proxies
+        with app.test_request_context(headers=headers, environ_base={'REMOTE_ADDR': '127.0.0.9'}):
+            assert throttle.client_address(request) == expected
+
+
+def test_login(make_app):
+    app = make_app(LOGIN_ADDRESS_BURST=2)
+    client = app.test_client()
+    for n, expected in enumerate((302, 302, 429)):
+        assert client.post('/login', data=dict(username='user%d' % n, password='x')).status_code == expected
+    assert login_throttle.counters()['login_throttled_address'] >= 1
+
+
+def test_login_behind_proxy(make_app):
+    app = make_app(LOGIN_ADDRESS_BURST=1, LOGIN_TRUSTED_PROXIES=1)
+    client = app.test_client()
+    for address, expected in (('1.1.1.1', 302), ('2.2.2.2', 302), ('1.1.1.1', 429)):
+        response = client.post('/login', data=dict(username=address, password='x'),
+                               headers={'X-Forwarded-For': 'spoofed, ' + address})
+        assert response.status_code == expected
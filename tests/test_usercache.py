@@ -0,0 +1,81 @@
+"""
+Identification
+    Module:     test_usercache.py
+    Author:     Victor Puska
+    Written:    Oct 19, 2026
+    Copyright:  (c) 2026 by VICTOR PUSKA.
+    License:    LICENSE_NAME, see LICENSE_FILE for more details.
+
+Description
+    The per worker cache of logged in users' principals.
+"""
+
+import json
+
+import pytest
+from sqlalchemy import event
+
+from core import User, db, session
+from core.cache import TTLCache
+from core.core import load_user, user_cache
+
+
+@pytest.fixture
+def user(app):
+    with app.app_context():
+        session.add(User(code='admin', name='Admin', type='SUPER'))
+        session.commit()
+    return app
+
+
+@pytest.fixture
+def statements(user):
+    executed = []
+
+    def count(conn, cursor, statement, *args):
+        executed.append(statement)
+    with user.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", count)
+    yield executed
+    event.remove(engine, "before_cursor_execute", count)
+
+
+def test_cache_hit(user, statements):
+    with user.app_context():
+        assert load_user('1').name == 'Admin'
+        assert len(statements) == 1
+        assert load_user('1').name == 'Admin'
+        assert load_user(1).is_superuser()
+        assert len(statements) == 1
+
+
+def test_grid_save_invalidates(user, statements, client):
+    with user.app_context():
+        assert load_user('1').name == 'Admin'
+    save = dict(cmd='save', changes=[dict(recid=1, name='Renamed')])
+    assert client.post('/users', data={'request': json.dumps(save)}).get_json()['status'] == 'success'
+    assert user_cache.get(1) is None
+    with user.app_context():
+        assert load_user('1').name == 'Renamed'
+
+
+def test_discarded_on_commit(user):
+    with user.app_context():
+        load_user('1')
+        session.get(User, 1).name = 'Flushed'
+        session.flush()
+        assert load_user('1').name == 'Admin'       # Kept until the transaction commits
+        session.rollback()
+        assert load_user('1').name == 'Admin'
+        session.get(User, 1).name = 'Committed'
+        session.commit()
+        assert load_user('1').name == 'Committed'
+
+
+def test_pop():
+    cache = TTLCache()
+    cache.set('a', 1)
+    cache.set('b', 2, ttl=-1)
+    assert cache.pop('a') == 1 and cache.pop('a') is None
+    assert cache.pop('b', 0) == 0 and len(cache) == 0
@@ -0,0 +1,54 @@
+"""
+Identification
+    Module:     test_views.py
+    Author:     Victor Puska
+    Written:    Oct 19, 2026
+    Copyright:  (c) 2026 by VICTOR PUSKA.
+    License:    LICENSE_NAME, see LICENSE_FILE for more details.
+
+Description
+    The index page: its paging through the users and the cached route table.
+"""
+
+import re
+
+from core import User, session
+from core import util
+
+
+def test_index_pages(make_app):
+    app = make_app(INDEX_PAGE_SIZE=3)
+    with app.app_context():
+        session.add_all([User(code='u%d' % i, name='User %d' % i) for i in range(7)])
+        session.commit()
+    client = app.test_client()
+
+    def page(url):
+        html = client.get(url).get_data(as_text=True)
+        names = re.findall(r'<td>(User \d+)</td>', html)
+        return names, 'Previous</a>' in html, 'Next</a>' in html
+
+    assert page('/') == (['User 0', 'User 1', 'User 2'], False, True)
+    assert page('/?page=2') == (['User 3', 'User 4', 'User 5'], True, True)
+    assert page('/?page=3') == (['User 6'], True, False)
+    assert page('/?page=4') == ([], True, False)
+    assert page('/?page=0') == page('/?page=x') == page('/')
+    html = client.get('/?page=2').get_data(as_text=True)
+    assert 'href="/?page=1"' in html and 'href="/?page=3"' in html
+
+
+def test_routes_cached(app, client, monkeypatch):
+    calls = []
+    iter_rules = app.url_map.iter_rules
+
+    def counted():
+        calls.append(1)
+        return iter_rules()
+    monkeypatch.setattr(app.url_map, 'iter_rules', counted)
+    for _ in range(3):
+        assert client.get('/').status_code == 200
+    assert len(calls) == 1
+    with app.test_request_context():
+        routes = util.get_routes(app)
+        assert routes is util.get_routes(app) is app.extensions['core_routes']
+        assert ('core.index', '/') in [(r.endpoint, r.url) for r in routes]
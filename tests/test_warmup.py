@@ -0,0 +1,49 @@
+"""
+Identification
+    Module:     test_warmup.py
+    Author:     Victor Puska
+    Written:    Oct 19, 2026
+    Copyright:  (c) 2026 by VICTOR PUSKA.
+    License:    LICENSE_NAME, see LICENSE_FILE for more details.
+
+Description
+    Worker warm-up.
+"""
+
+from sqlalchemy import event
+
+from core import db
+from core.warmup import init_warmup, is_ready, compile_views
+
+
+def test_warmup_starts_at_first_request(app, client):
+    app.config['WARMUP'] = True
+    init_warmup(app)
+    assert not is_ready(app)
+    assert not app.extensions['core_ready'].wait(0.2)     # Not started without a request
+    client.get('/ready')
+    assert app.extensions['core_ready'].wait(10)
+    assert client.get('/ready').status_code == 200
+
+
+def test_without_warmup(app, client):
+    assert is_ready(app)
+    assert client.get('/ready').status_code == 200
+
+
+def test_compile_views_reads_no_rows(app):
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+    with app.test_request_context():
+        event.listen(db.engine, "before_cursor_execute", record)
+        try:
+            compile_views()
+        finally:
+            event.remove(db.engine, "before_cursor_execute", record)
+    selects = [s for s in statements if 'count(' in s.lower()]
+    assert selects
+    assert all('LIMIT' in s for s in selects)
+    # The async views share the sync views' statements
+    assert len([s for s in statements if 'GROUP BY' in s]) == 1